@@ -1,5 +1,6 @@
 """CLI entry point for Decoder."""
 
+import functools
 import json
 from pathlib import Path
 from typing import Annotated
@@ -10,7 +11,8 @@ from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn
 
 from decoder.core.graph.models import TreeNode
 from decoder.core.indexer import Indexer
-from decoder.core.models import Edge
+from decoder.core.models import Edge, Symbol
+from decoder.core.parse_cache import ParseCache
 from decoder.core.storage import SymbolRepository, get_default_db_path
 
 app = typer.Typer(
@@ -31,25 +33,43 @@ def get_repo(path: Path) -> SymbolRepository:
 
 def format_context(edge: Edge) -> str:
     """Format edge context as an annotation string."""
+    return _format_context_key(
+        edge.is_conditional,
+        edge.condition,
+        edge.is_loop,
+        edge.is_try_block,
+        edge.is_except_handler,
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_context_key(
+    is_conditional: bool,
+    condition: str | None,
+    is_loop: bool,
+    is_try_block: bool,
+    is_except_handler: bool,
+) -> str:
+    """Build the annotation for one combination of context flags (memoized)."""
     annotations = []
 
-    if edge.is_conditional:
-        if edge.condition:
-            if len(edge.condition) <= _MAX_CONDITION_DISPLAY:
-                cond = edge.condition
+    if is_conditional:
+        if condition:
+            if len(condition) <= _MAX_CONDITION_DISPLAY:
+                cond = condition
             else:
-                cond = edge.condition[: _MAX_CONDITION_DISPLAY - 3] + "..."
+                cond = condition[: _MAX_CONDITION_DISPLAY - 3] + "..."
             annotations.append(f"if {cond}")
         else:
             annotations.append("conditional")
 
-    if edge.is_loop:
+    if is_loop:
         annotations.append("in loop")
 
-    if edge.is_try_block:
+    if is_try_block:
         annotations.append("in try")
 
-    if edge.is_except_handler:
+    if is_except_handler:
         annotations.append("in except")
 
     if annotations:
@@ -57,6 +77,53 @@ def format_context(edge: Edge) -> str:
     return ""
 
 
+@functools.lru_cache(maxsize=4096)
+def _format_tree_context(
+    is_conditional: bool, condition: str | None, is_loop: bool, is_try_block: bool
+) -> str:
+    """Build the compact tree annotation for one combination of flags (memoized)."""
+    parts = []
+    if is_conditional:
+        cond = condition
+        if cond:
+            if len(cond) > _MAX_CONDITION_DISPLAY:
+                cond = cond[: _MAX_CONDITION_DISPLAY - 3] + "..."
+            parts.append(f"if {cond}")
+        else:
+            parts.append("conditional")
+    if is_loop:
+        parts.append("loop")
+    if is_try_block:
+        parts.append("try")
+    return f" [yellow]\\[{', '.join(parts)}][/]" if parts else ""
+
+
+def _symbol_json(s: Symbol) -> dict[str, object]:
+    """Flatten a symbol into its JSON row."""
+    return {
+        "id": s.id,
+        "name": s.name,
+        "qualified_name": s.qualified_name,
+        "type": s.type.value,
+        "file": str(s.file),
+        "line": s.line,
+        "end_line": s.end_line,
+    }
+
+
+def _call_site_json(s: Symbol, edge: Edge) -> dict[str, object]:
+    """Flatten a caller/callee and the call's line into its JSON row."""
+    return {
+        "id": s.id,
+        "name": s.name,
+        "qualified_name": s.qualified_name,
+        "type": s.type.value,
+        "file": str(s.file),
+        "line": s.line,
+        "call_line": edge.call_line,
+    }
+
+
 @app.command()
 def index(
     path: Annotated[Path, typer.Argument(help="Directory to index")] = Path("."),
@@ -69,7 +136,7 @@ def index(
     path = path.resolve()
 
     with get_repo(path) as repo:
-        indexer = Indexer(repo)
+        indexer = Indexer(repo, ParseCache(get_default_db_path(path).parent / "parse_cache"))
 
         if force:
             repo.clear()
@@ -148,18 +215,7 @@ def find(
         symbols = repo.symbols.find(name, type_filter)
 
         if output_json:
-            result = [
-                {
-                    "id": s.id,
-                    "name": s.name,
-                    "qualified_name": s.qualified_name,
-                    "type": s.type.value,
-                    "file": str(s.file),
-                    "line": s.line,
-                    "end_line": s.end_line,
-                }
-                for s in symbols
-            ]
+            result = [_symbol_json(s) for s in symbols]
             print(json.dumps(result))
         else:
             if not symbols:
@@ -180,36 +236,18 @@ def callers(
 
     with get_repo(path) as repo:
         symbols = repo.symbols.find(name)
+        callers_by_id = repo.edges.get_callers_many([s.id for s in symbols])
 
         if output_json:
-            results = []
-            for symbol in symbols:
-                caller_list = repo.edges.get_callers(symbol.id)
-                results.append(
-                    {
-                        "symbol": {
-                            "id": symbol.id,
-                            "name": symbol.name,
-                            "qualified_name": symbol.qualified_name,
-                            "type": symbol.type.value,
-                            "file": str(symbol.file),
-                            "line": symbol.line,
-                            "end_line": symbol.end_line,
-                        },
-                        "callers": [
-                            {
-                                "id": caller.id,
-                                "name": caller.name,
-                                "qualified_name": caller.qualified_name,
-                                "type": caller.type.value,
-                                "file": str(caller.file),
-                                "line": caller.line,
-                                "call_line": edge.call_line,
-                            }
-                            for caller, edge in caller_list
-                        ],
-                    }
-                )
+            results = [
+                {
+                    "symbol": _symbol_json(symbol),
+                    "callers": [
+                        _call_site_json(caller, edge) for caller, edge in callers_by_id[symbol.id]
+                    ],
+                }
+                for symbol in symbols
+            ]
             print(json.dumps(results))
         else:
             if not symbols:
@@ -220,7 +258,7 @@ def callers(
                 console.print(f"\n[bold cyan]{symbol.qualified_name}[/] ({symbol.type.value})")
                 console.print(f"  [dim]{symbol.file}:{symbol.line}[/]")
 
-                caller_list = repo.edges.get_callers(symbol.id)
+                caller_list = callers_by_id[symbol.id]
                 if not caller_list:
                     console.print("  [dim]No callers found[/]")
                 else:
@@ -242,36 +280,18 @@ def callees(
 
     with get_repo(path) as repo:
         symbols = repo.symbols.find(name)
+        callees_by_id = repo.edges.get_callees_many([s.id for s in symbols])
 
         if output_json:
-            results = []
-            for symbol in symbols:
-                callee_list = repo.edges.get_callees(symbol.id)
-                results.append(
-                    {
-                        "symbol": {
-                            "id": symbol.id,
-                            "name": symbol.name,
-                            "qualified_name": symbol.qualified_name,
-                            "type": symbol.type.value,
-                            "file": str(symbol.file),
-                            "line": symbol.line,
-                            "end_line": symbol.end_line,
-                        },
-                        "callees": [
-                            {
-                                "id": callee.id,
-                                "name": callee.name,
-                                "qualified_name": callee.qualified_name,
-                                "type": callee.type.value,
-                                "file": str(callee.file),
-                                "line": callee.line,
-                                "call_line": edge.call_line,
-                            }
-                            for callee, edge in callee_list
-                        ],
-                    }
-                )
+            results = [
+                {
+                    "symbol": _symbol_json(symbol),
+                    "callees": [
+                        _call_site_json(callee, edge) for callee, edge in callees_by_id[symbol.id]
+                    ],
+                }
+                for symbol in symbols
+            ]
             print(json.dumps(results))
         else:
             if not symbols:
@@ -282,7 +302,7 @@ def callees(
                 console.print(f"\n[bold cyan]{symbol.qualified_name}[/] ({symbol.type.value})")
                 console.print(f"  [dim]{symbol.file}:{symbol.line}[/]")
 
-                callee_list = repo.edges.get_callees(symbol.id)
+                callee_list = callees_by_id[symbol.id]
                 if not callee_list:
                     console.print("  [dim]No calls found[/]")
                 else:
@@ -302,7 +322,7 @@ def trace(
 ) -> None:
     """Trace the call as a tree (callers and callees)."""
     from decoder.core.graph import load_from_repository
-    from decoder.core.graph.traversal import get_callee_tree, get_caller_tree
+    from decoder.core.graph.traversal import get_callee_tree, get_caller_tree, iter_tree
 
     path = Path(".").resolve()
 
@@ -313,16 +333,14 @@ def trace(
             console.print(f"No matches for '[cyan]{name}[/cyan]'")
             return
 
-        start_symbol = max(
-            symbols,
-            key=lambda s: len(repo.edges.get_callees(s.id)) + len(repo.edges.get_callers(s.id)),
-        )
+        counts = repo.edges.connection_counts([s.id for s in symbols])
+        start_symbol = max(symbols, key=lambda s: counts.get(s.id, 0))
 
         graph = load_from_repository(repo)
-        callee_tree = get_callee_tree(graph, start_symbol.id, max_depth)
         caller_tree = get_caller_tree(graph, start_symbol.id, max_depth)
 
         if output_json:
+            callee_tree = get_callee_tree(graph, start_symbol.id, max_depth)
 
             def tree_to_dict(node: TreeNode, depth: int = 0) -> dict[str, object]:
                 return {
@@ -351,78 +369,76 @@ def trace(
 
             def format_ctx(node: TreeNode) -> str:
                 """Format context annotation."""
-                parts = []
-                if node.is_conditional:
-                    cond = node.condition
-                    if cond:
-                        if len(cond) > _MAX_CONDITION_DISPLAY:
-                            cond = cond[: _MAX_CONDITION_DISPLAY - 3] + "..."
-                        parts.append(f"if {cond}")
-                    else:
-                        parts.append("conditional")
-                if node.is_loop:
-                    parts.append("loop")
-                if node.is_try_block:
-                    parts.append("try")
-                return f" [yellow]\\[{', '.join(parts)}][/]" if parts else ""
+                return _format_tree_context(
+                    node.is_conditional, node.condition, node.is_loop, node.is_try_block
+                )
 
+            @functools.cache
             def get_rel_path(file_path: Path) -> str:
                 try:
                     return str(file_path.relative_to(path))
                 except ValueError:
                     return file_path.name
 
-            def print_callers(node: TreeNode, prefix: str = "", is_last: bool = True) -> None:
-                """Print caller tree (going up)."""
+            def render_callers(
+                node: TreeNode, lines: list[str], prefix: str = "", is_last: bool = True
+            ) -> None:
+                """Render caller tree (going up) into lines."""
                 if not node.children:
                     return
                 for i, child in enumerate(node.children):
                     is_child_last = i == len(node.children) - 1
-                    # Print children first (outermost callers)
-                    print_callers(child, prefix + ("   " if is_last else "│  "), is_child_last)
-                    # Then print this caller
+                    # Render children first (outermost callers)
+                    render_callers(
+                        child, lines, prefix + ("   " if is_last else "│  "), is_child_last
+                    )
+                    # Then render this caller
                     branch = "└─" if is_child_last else "├─"
                     ctx = format_ctx(child)
                     rel = get_rel_path(child.symbol.file)
-                    console.print(
+                    lines.append(
                         f"{prefix}{branch} [blue]{child.symbol.name}[/]{ctx} "
                         f"[dim]{rel}:{child.symbol.line}[/]"
                     )
 
-            def print_callees(
-                node: TreeNode, prefix: str = "", is_last: bool = True, skip_root: bool = False
-            ) -> None:
-                """Print callee tree (going down)."""
-                if not skip_root:
-                    branch = "└─" if is_last else "├─"
-                    ctx = format_ctx(node)
-                    rel = get_rel_path(node.symbol.file)
-                    console.print(
-                        f"{prefix}{branch} [cyan]{node.symbol.name}[/]{ctx} "
-                        f"[dim]{rel}:{node.symbol.line}[/]"
-                    )
-                child_prefix = prefix + ("   " if is_last else "│  ")
-                for i, child in enumerate(node.children):
-                    is_child_last = i == len(node.children) - 1
-                    print_callees(child, child_prefix if not skip_root else prefix, is_child_last)
-
+            # Rich parses markup per print call, so each tree is emitted in one call.
+            # One line per caller below the selected symbol
+            caller_lines: list[str] = []
             if caller_tree and caller_tree.children:
                 console.print("[dim]Callers:[/]")
-                print_callers(caller_tree)
+                render_callers(caller_tree, caller_lines)
+                console.print("\n".join(caller_lines))
                 console.print()
 
             console.print(f"[bold yellow]▶ {start_symbol.name}[/] [yellow]◀ selected[/]")
             console.print()
 
-            if callee_tree and callee_tree.children:
+            # The callee tree is streamed rather than materialized as TreeNodes.
+            lines: list[str] = []
+            prefix_parts: list[str] = []
+            for depth, symbol, edge, is_last in iter_tree(
+                graph, start_symbol.id, "callees", max_depth
+            ):
+                if edge is None:
+                    continue
+                del prefix_parts[depth - 1 :]
+                branch = "└─" if is_last else "├─"
+                ctx = _format_tree_context(
+                    edge.is_conditional, edge.condition, edge.is_loop, edge.is_try_block
+                )
+                rel = get_rel_path(symbol.file)
+                lines.append(
+                    f"{''.join(prefix_parts)}{branch} [cyan]{symbol.name}[/]{ctx} "
+                    f"[dim]{rel}:{symbol.line}[/]"
+                )
+                prefix_parts.append("   " if is_last else "│  ")
+            if lines:
                 console.print("[dim]Callees:[/]")
-                for i, child in enumerate(callee_tree.children):
-                    is_last = i == len(callee_tree.children) - 1
-                    print_callees(child, "", is_last)
+                console.print("\n".join(lines))
 
             # Stats
-            caller_count = len(list(caller_tree)) - 1 if caller_tree else 0
-            callee_count = len(list(callee_tree)) - 1 if callee_tree else 0
+            caller_count = len(caller_lines)
+            callee_count = len(lines)
             console.print(f"\n[dim]Callers: {caller_count} | Callees: {callee_count}[/]")
 
 
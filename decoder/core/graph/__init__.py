@@ -7,6 +7,7 @@ Data Structures:
     - CallGraph: Adjacency list representation with O(1) lookups
     - TreeNode: Tree representation for caller/callee hierarchies
     - Path: A sequence of symbols representing a call chain
+    - CSRAdjacency: Compressed sparse row arrays for integer-only algorithms
 
 Algorithms:
     - traversal: DFS tree extraction (get_callee_tree, get_caller_tree)
@@ -20,10 +21,11 @@ Loading:
 
 from decoder.core.graph.base import CallGraph
 from decoder.core.graph.loader import load_from_repository, load_subgraph
-from decoder.core.graph.models import Path, TreeNode
+from decoder.core.graph.models import CSRAdjacency, Path, TreeNode
 
 __all__ = [
     "CallGraph",
+    "CSRAdjacency",
     "Path",
     "TreeNode",
     "load_from_repository",
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import heapq
 from collections import deque
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,93 +13,148 @@ if TYPE_CHECKING:
 
 
 def has_cycle(graph: CallGraph) -> bool:
-    """Check for cycles using three-color DFS. O(V + E)."""
-    white, gray, black = 0, 1, 2
-    color: dict[int, int] = {v: white for v in graph.symbols}
-
-    def dfs(node_id: int) -> bool:
-        color[node_id] = gray
-        for callee_id, _ in graph._out.get(node_id, []):
-            if callee_id in color:
-                if color[callee_id] == gray:
-                    return True
-                if color[callee_id] == white and dfs(callee_id):
-                    return True
-        color[node_id] = black
-        return False
+    """Check for cycles using three-color DFS. O(V + E).
 
-    return any(color[nid] == white and dfs(nid) for nid in graph.symbols)
+    Iterative over the graph's CSR arrays, so deep call chains cannot hit the
+    recursion limit and the inner loop touches only integers.
+    """
+    csr = graph.freeze()
+    return _has_cycle_csr(csr.row_ptr, csr.col_ind, csr.num_nodes)
 
 
 def find_cycles(graph: CallGraph, max_cycles: int = 10) -> list[list[Symbol]]:
-    """Find all cycles in the graph."""
+    """Find all cycles in the graph.
+
+    Iterative DFS over the CSR arrays with array-indexed visited/stack state.
+    """
+    csr = graph.freeze()
+    row_ptr, col_ind, ids = csr.row_ptr, csr.col_ind, csr.ids
+    n = csr.num_nodes
     cycles: list[list[Symbol]] = []
-    visited: set[int] = set()
-    stack: list[int] = []
-    stack_set: set[int] = set()
-
-    def dfs(node_id: int) -> None:
-        if len(cycles) >= max_cycles:
-            return
-
-        visited.add(node_id)
-        stack.append(node_id)
-        stack_set.add(node_id)
-
-        for callee_id, _ in graph._out.get(node_id, []):
-            if callee_id not in visited:
-                dfs(callee_id)
-            elif callee_id in stack_set:
-                idx = stack.index(callee_id)
-                cycle = [graph.symbols[n] for n in stack[idx:]]
+    visited = bytearray(n)
+    stack_pos = [-1] * n
+
+    for root in range(n):
+        if visited[root]:
+            continue
+
+        visited[root] = 1
+        stack_pos[root] = 0
+        stack: list[int] = [root]
+        pos: list[int] = [row_ptr[root]]
+
+        while stack:
+            if len(cycles) >= max_cycles:
+                return cycles
+
+            u = stack[-1]
+            p = pos[-1]
+            if p == row_ptr[u + 1]:
+                stack_pos[stack.pop()] = -1
+                pos.pop()
+                continue
+            pos[-1] = p + 1
+
+            v = col_ind[p]
+            if not visited[v]:
+                visited[v] = 1
+                stack_pos[v] = len(stack)
+                stack.append(v)
+                pos.append(row_ptr[v])
+            elif stack_pos[v] >= 0:
+                cycle = [graph.symbols[ids[k]] for k in stack[stack_pos[v] :]]
                 cycles.append(cycle)
 
-        stack.pop()
-        stack_set.remove(node_id)
-
-    for nid in graph.symbols:
-        if nid not in visited:
-            dfs(nid)
-
     return cycles
 
 
 def get_entry_points(graph: CallGraph) -> list[Symbol]:
     """Get symbols with no callers (in-degree = 0). O(V)."""
-    return [graph.symbols[sid] for sid in graph.symbols if not graph._in.get(sid)]
+    in_deg = graph._in_deg
+    return [sym for sid, sym in graph.symbols.items() if not in_deg.get(sid)]
 
 
 def get_leaf_functions(graph: CallGraph) -> list[Symbol]:
     """Get symbols with no callees (out-degree = 0). O(V)."""
-    return [graph.symbols[sid] for sid in graph.symbols if not graph._out.get(sid)]
+    out_deg = graph._out_deg
+    return [sym for sid, sym in graph.symbols.items() if not out_deg.get(sid)]
 
 
 def get_hot_paths(graph: CallGraph, top_k: int = 10) -> list[Symbol]:
-    """Get symbols with highest connectivity. O(V log V)."""
-    scored = [
-        (sid, len(graph._in.get(sid, [])) + len(graph._out.get(sid, []))) for sid in graph.symbols
-    ]
-    scored.sort(key=lambda x: -x[1])
-    return [graph.symbols[sid] for sid, _ in scored[:top_k]]
+    """Get symbols with highest connectivity. O(V log k)."""
+    in_deg, out_deg = graph._in_deg, graph._out_deg
+    scored = [(sid, in_deg.get(sid, 0) + out_deg.get(sid, 0)) for sid in graph.symbols]
+    top = heapq.nlargest(top_k, scored, key=lambda x: x[1])
+    return [graph.symbols[sid] for sid, _ in top]
 
 
 def topological_sort(graph: CallGraph) -> list[Symbol] | None:
-    """Topological sort using Kahn's algorithm. O(V + E).
+    """Topological sort using Kahn's algorithm over the CSR arrays. O(V + E).
 
     Returns None if graph has cycles.
     """
-    in_degree = {sid: len(graph._in.get(sid, [])) for sid in graph.symbols}
-    queue: deque[int] = deque(sid for sid, d in in_degree.items() if d == 0)
-    result: list[Symbol] = []
+    csr = graph.freeze()
+    order = _topological_order_csr(csr.row_ptr, csr.col_ind, csr.num_nodes)
+    if order is None:
+        return None
+    symbols, ids = graph.symbols, csr.ids
+    return [symbols[ids[u]] for u in order]
 
-    while queue:
-        node_id = queue.popleft()
-        result.append(graph.symbols[node_id])
 
-        for callee_id, _ in graph._out.get(node_id, []):
-            if callee_id in in_degree:
-                in_degree[callee_id] -= 1
-                if in_degree[callee_id] == 0:
-                    queue.append(callee_id)
+# Integer-only kernels over CSR arrays; no Symbol or Edge objects are touched.
+
 
-    return result if len(result) == len(graph.symbols) else None
+def _has_cycle_csr(row_ptr: Sequence[int], col_ind: Sequence[int], n: int) -> bool:
+    """Three-color iterative DFS on CSR arrays."""
+    white, gray, black = 0, 1, 2
+    color = bytearray(n)
+
+    for root in range(n):
+        if color[root] != white:
+            continue
+        color[root] = gray
+        stack = [root]
+        pos = [row_ptr[root]]
+
+        while stack:
+            u = stack[-1]
+            p = pos[-1]
+            if p == row_ptr[u + 1]:
+                color[u] = black
+                stack.pop()
+                pos.pop()
+                continue
+            pos[-1] = p + 1
+            v = col_ind[p]
+            c = color[v]
+            if c == gray:
+                return True
+            if c == white:
+                color[v] = gray
+                stack.append(v)
+                pos.append(row_ptr[v])
+
+    return False
+
+
+def _topological_order_csr(
+    row_ptr: Sequence[int], col_ind: Sequence[int], n: int
+) -> list[int] | None:
+    """Kahn's algorithm on CSR arrays; None if a cycle remains."""
+    in_degree = [0] * n
+    for v in col_ind:
+        in_degree[v] += 1
+
+    queue: deque[int] = deque(u for u, d in enumerate(in_degree) if d == 0)
+    order: list[int] = []
+
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for k in range(row_ptr[u], row_ptr[u + 1]):
+            v = col_ind[k]
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                queue.append(v)
+
+    return order if len(order) == n else None
@@ -2,25 +2,93 @@
 
 from __future__ import annotations
 
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from decoder.core.graph.models import CSRAdjacency
 from decoder.core.models import Edge, Symbol
 
 
+def _by_call_line(pair: tuple[int, Edge]) -> int:
+    return pair[1].call_line
+
+
 class CallGraph:
     """Directed graph for call relationships.
 
     Uses adjacency lists for O(1) neighbor lookup.
+
+    Symbols may be loaded lazily: raw rows are kept in ``_sym_rows`` and only
+    turned into Symbol objects when looked up (get_symbol) or when the full
+    ``symbols`` mapping is requested.
     """
 
-    __slots__ = ("_out", "_in", "_symbols", "_edges")
+    __slots__ = (
+        "_out",
+        "_in",
+        "_out_deg",
+        "_in_deg",
+        "_out_sorted",
+        "_in_sorted",
+        "_symbols",
+        "_sym_rows",
+        "_edges",
+        "_csr",
+    )
 
     def __init__(self) -> None:
         self._out: dict[int, list[tuple[int, Edge]]] = {}
         self._in: dict[int, list[tuple[int, Edge]]] = {}
+        self._out_deg: dict[int, int] = {}
+        self._in_deg: dict[int, int] = {}
+        # Per-node adjacency ordered by call line, filled lazily
+        self._out_sorted: dict[int, list[tuple[int, Edge]]] = {}
+        self._in_sorted: dict[int, list[tuple[int, Edge]]] = {}
         self._symbols: dict[int, Symbol] = {}
+        self._sym_rows: dict[int, tuple[Any, ...]] = {}
         self._edges: list[Edge] = []
+        self._csr: CSRAdjacency | None = None
+
+    @classmethod
+    def _bulk_load(
+        cls,
+        symbols: Iterable[Symbol],
+        edges: Iterable[Edge],
+        symbol_rows: Iterable[tuple[Any, ...]] = (),
+    ) -> CallGraph:
+        """Build a graph in one pass over symbols and edges. O(V + E).
+
+        Skips the per-call membership checks of add_symbol/add_edge.
+        ``symbol_rows`` (see Symbol.from_tuple) are stored unmaterialized.
+        """
+        graph = cls()
+        graph._symbols = {s.id: s for s in symbols}
+        graph._sym_rows = {row[0]: row for row in symbol_rows}
+        if graph._sym_rows and graph._symbols:
+            graph._materialize_symbols()
+
+        out: defaultdict[int, list[tuple[int, Edge]]] = defaultdict(list)
+        in_: defaultdict[int, list[tuple[int, Edge]]] = defaultdict(list)
+        edge_list: list[Edge] = []
+        for e in edges:
+            out[e.caller_id].append((e.callee_id, e))
+            in_[e.callee_id].append((e.caller_id, e))
+            edge_list.append(e)
+
+        graph._out = dict(out)
+        graph._in = dict(in_)
+        graph._out_deg = {sid: len(lst) for sid, lst in out.items()}
+        graph._in_deg = {sid: len(lst) for sid, lst in in_.items()}
+        graph._edges = edge_list
+        return graph
 
     def add_symbol(self, symbol: Symbol) -> None:
         """Add a symbol node. O(1)."""
+        self._csr = None
+        if self._sym_rows:
+            self._materialize_symbols()
         self._symbols[symbol.id] = symbol
         if symbol.id not in self._out:
             self._out[symbol.id] = []
@@ -29,6 +97,7 @@ class CallGraph:
 
     def add_edge(self, edge: Edge) -> None:
         """Add a call edge. O(1)."""
+        self._csr = None
         self._edges.append(edge)
         if edge.caller_id not in self._out:
             self._out[edge.caller_id] = []
@@ -36,38 +105,125 @@ class CallGraph:
             self._in[edge.callee_id] = []
         self._out[edge.caller_id].append((edge.callee_id, edge))
         self._in[edge.callee_id].append((edge.caller_id, edge))
+        self._out_deg[edge.caller_id] = self._out_deg.get(edge.caller_id, 0) + 1
+        self._in_deg[edge.callee_id] = self._in_deg.get(edge.callee_id, 0) + 1
+        self._out_sorted.pop(edge.caller_id, None)
+        self._in_sorted.pop(edge.callee_id, None)
+
+    def finalize(self) -> None:
+        """Pre-sort every adjacency list by call line. O(E log d).
+
+        Optional: traversals sort each node's neighbors on first use anyway.
+        """
+        for symbol_id in self._out:
+            self._sorted_out(symbol_id)
+        for symbol_id in self._in:
+            self._sorted_in(symbol_id)
+
+    def _sorted_out(self, symbol_id: int) -> list[tuple[int, Edge]]:
+        """(callee_id, edge) pairs ordered by call line, cached per node."""
+        pairs = self._out_sorted.get(symbol_id)
+        if pairs is None:
+            pairs = sorted(self._out.get(symbol_id, ()), key=_by_call_line)
+            self._out_sorted[symbol_id] = pairs
+        return pairs
+
+    def _sorted_in(self, symbol_id: int) -> list[tuple[int, Edge]]:
+        """(caller_id, edge) pairs ordered by call line, cached per node."""
+        pairs = self._in_sorted.get(symbol_id)
+        if pairs is None:
+            pairs = sorted(self._in.get(symbol_id, ()), key=_by_call_line)
+            self._in_sorted[symbol_id] = pairs
+        return pairs
+
+    def freeze(self) -> CSRAdjacency:
+        """Build (or return the cached) CSR adjacency. O(V + E).
+
+        Integer-only algorithms run on the CSR arrays instead of the
+        dict-of-lists adjacency. Adding symbols or edges drops the cache.
+        """
+        if self._csr is not None:
+            return self._csr
+
+        ids = array("q", self._sym_rows or self._symbols)
+        index = {sid: i for i, sid in enumerate(ids)}
+        n = len(ids)
+
+        row_ptr = array("q", bytes(8 * (n + 1)))
+        pairs: list[tuple[int, int, int]] = []
+        for j, edge in enumerate(self._edges):
+            u = index.get(edge.caller_id)
+            v = index.get(edge.callee_id)
+            if u is not None and v is not None:
+                pairs.append((u, v, j))
+                row_ptr[u + 1] += 1
+        for u in range(n):
+            row_ptr[u + 1] += row_ptr[u]
+
+        # Stable counting sort by caller index keeps each row in insertion order.
+        col_ind = array("q", bytes(8 * len(pairs)))
+        edge_idx = array("q", bytes(8 * len(pairs)))
+        fill = row_ptr[:-1]
+        for u, v, j in pairs:
+            k = fill[u]
+            col_ind[k] = v
+            edge_idx[k] = j
+            fill[u] = k + 1
+
+        self._csr = CSRAdjacency(
+            ids=ids, index=index, row_ptr=row_ptr, col_ind=col_ind, edge_idx=edge_idx
+        )
+        return self._csr
 
     def get_symbol(self, symbol_id: int) -> Symbol | None:
-        """Get symbol by ID. O(1)."""
-        return self._symbols.get(symbol_id)
+        """Get symbol by ID, materializing it if loaded lazily. O(1)."""
+        symbol = self._symbols.get(symbol_id)
+        if symbol is None:
+            row = self._sym_rows.get(symbol_id)
+            if row is not None:
+                symbol = self._symbols[symbol_id] = Symbol.from_tuple(row)
+        return symbol
+
+    def __contains__(self, symbol_id: int) -> bool:
+        """Check whether a symbol node exists without materializing it. O(1)."""
+        return symbol_id in self._sym_rows or symbol_id in self._symbols
+
+    def __getitem__(self, symbol_id: int) -> Symbol:
+        """Get symbol by ID, raising KeyError if absent. O(1)."""
+        symbol = self.get_symbol(symbol_id)
+        if symbol is None:
+            raise KeyError(symbol_id)
+        return symbol
 
     def get_callees(self, symbol_id: int) -> list[tuple[Symbol, Edge]]:
         """Get direct callees. O(out-degree)."""
+        lookup = self.get_symbol if self._sym_rows else self._symbols.get
         return [
-            (self._symbols[cid], edge)
-            for cid, edge in self._out.get(symbol_id, [])
-            if cid in self._symbols
+            (sym, edge)
+            for cid, edge in self._out.get(symbol_id, ())
+            if (sym := lookup(cid)) is not None
         ]
 
     def get_callers(self, symbol_id: int) -> list[tuple[Symbol, Edge]]:
         """Get direct callers. O(in-degree)."""
+        lookup = self.get_symbol if self._sym_rows else self._symbols.get
         return [
-            (self._symbols[cid], edge)
-            for cid, edge in self._in.get(symbol_id, [])
-            if cid in self._symbols
+            (sym, edge)
+            for cid, edge in self._in.get(symbol_id, ())
+            if (sym := lookup(cid)) is not None
         ]
 
     def out_degree(self, symbol_id: int) -> int:
         """Number of callees. O(1)."""
-        return len(self._out.get(symbol_id, []))
+        return self._out_deg.get(symbol_id, 0)
 
     def in_degree(self, symbol_id: int) -> int:
         """Number of callers. O(1)."""
-        return len(self._in.get(symbol_id, []))
+        return self._in_deg.get(symbol_id, 0)
 
     @property
     def num_nodes(self) -> int:
-        return len(self._symbols)
+        return len(self._sym_rows) if self._sym_rows else len(self._symbols)
 
     @property
     def num_edges(self) -> int:
@@ -75,7 +231,21 @@ class CallGraph:
 
     @property
     def symbols(self) -> dict[int, Symbol]:
+        """All symbols by ID. Materializes any lazily loaded rows."""
+        if self._sym_rows:
+            self._materialize_symbols()
         return self._symbols
 
+    def _materialize_symbols(self) -> None:
+        """Turn all pending rows into Symbols, keeping row order."""
+        cached = self._symbols
+        symbols = {
+            sid: cached.pop(sid) if sid in cached else Symbol.from_tuple(row)
+            for sid, row in self._sym_rows.items()
+        }
+        symbols.update(cached)
+        self._symbols = symbols
+        self._sym_rows = {}
+
     def __repr__(self) -> str:
         return f"CallGraph(nodes={self.num_nodes}, edges={self.num_edges})"
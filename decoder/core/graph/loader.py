@@ -2,42 +2,40 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import sqlite3
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Final
 
 from decoder.core.graph.base import CallGraph
-from decoder.core.models import Edge, EdgeType, Symbol
+from decoder.core.models import Edge, Symbol
+from decoder.core.storage import SYMBOL_COLUMNS
 
 if TYPE_CHECKING:
     from decoder.core.storage import SymbolRepository
 
+_EDGE_COLUMNS: Final = (
+    "id, caller_id, callee_id, call_line, call_type, "
+    "is_conditional, condition, is_loop, is_try_block, is_except_handler"
+)
 
-def load_from_repository(repo: SymbolRepository) -> CallGraph:
-    """Load full graph from repository. O(V + E)."""
-    graph = CallGraph()
-    conn = repo._get_connection()
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds).
+_MAX_IN_PARAMS: Final = 500
 
-    cursor = conn.execute("SELECT * FROM symbols")
-    for row in cursor.fetchall():
-        symbol = Symbol.from_row(row)
-        graph.add_symbol(symbol)
-
-    cursor = conn.execute("SELECT * FROM edges")
-    for row in cursor.fetchall():
-        edge = Edge(
-            id=row["id"],
-            caller_id=row["caller_id"],
-            callee_id=row["callee_id"],
-            call_line=row["call_line"],
-            call_type=EdgeType(row["call_type"]),
-            is_conditional=bool(row["is_conditional"]),
-            condition=row["condition"],
-            is_loop=bool(row["is_loop"]),
-            is_try_block=bool(row["is_try_block"]),
-            is_except_handler=bool(row["is_except_handler"]),
-        )
-        graph.add_edge(edge)
 
-    return graph
+def load_from_repository(repo: SymbolRepository) -> CallGraph:
+    """Load full graph from repository. O(V + E).
+
+    Rows are read as plain tuples straight off the cursor, avoiding both the
+    fetchall() materialization and sqlite3.Row's per-column name lookup.
+    Symbol rows are kept raw and only become Symbols when first accessed.
+    """
+    conn = repo._get_connection()
+    symbol_rows = _tuple_cursor(conn, f"SELECT {SYMBOL_COLUMNS} FROM symbols")
+    edges = map(
+        Edge.from_tuple,
+        _tuple_cursor(conn, f"SELECT {_EDGE_COLUMNS} FROM edges ORDER BY caller_id"),
+    )
+    return CallGraph._bulk_load((), edges, symbol_rows=symbol_rows)
 
 
 def load_subgraph(
@@ -48,46 +46,61 @@ def load_subgraph(
 ) -> CallGraph:
     """Load only the subgraph reachable from root.
 
-    More memory efficient for large codebases.
+    More memory efficient for large codebases. The BFS runs level by level,
+    fetching each frontier's symbols and edges with one IN query per batch
+    rather than two queries per node.
     """
     graph = CallGraph()
     conn = repo._get_connection()
+    edge_column = "caller_id" if direction == "callees" else "callee_id"
     visited: set[int] = set()
-    queue: list[tuple[int, int]] = [(root_id, 0)]
-
-    while queue:
-        symbol_id, depth = queue.pop(0)
-        if symbol_id in visited or depth > max_depth:
-            continue
-        visited.add(symbol_id)
-
-        cursor = conn.execute("SELECT * FROM symbols WHERE id = ?", (symbol_id,))
-        row = cursor.fetchone()
-        if row:
-            graph.add_symbol(Symbol.from_row(row))
-
-        if direction == "callees":
-            edge_cursor = conn.execute("SELECT * FROM edges WHERE caller_id = ?", (symbol_id,))
-        else:
-            edge_cursor = conn.execute("SELECT * FROM edges WHERE callee_id = ?", (symbol_id,))
-
-        for edge_row in edge_cursor.fetchall():
-            edge = Edge(
-                id=edge_row["id"],
-                caller_id=edge_row["caller_id"],
-                callee_id=edge_row["callee_id"],
-                call_line=edge_row["call_line"],
-                call_type=EdgeType(edge_row["call_type"]),
-                is_conditional=bool(edge_row["is_conditional"]),
-                condition=edge_row["condition"],
-                is_loop=bool(edge_row["is_loop"]),
-                is_try_block=bool(edge_row["is_try_block"]),
-                is_except_handler=bool(edge_row["is_except_handler"]),
+    level: set[int] = {root_id}
+    depth = 0
+
+    while level and depth <= max_depth:
+        visited |= level
+        # Deduplicated at enqueue time: a node reached through several edges
+        # (or already visited) is fetched at most once.
+        next_level: set[int] = set()
+
+        for batch in _batched(sorted(level)):
+            placeholders = ",".join("?" * len(batch))
+            symbol_rows = _tuple_cursor(
+                conn,
+                f"SELECT {SYMBOL_COLUMNS} FROM symbols WHERE id IN ({placeholders})",
+                batch,
+            )
+            for row in symbol_rows:
+                graph.add_symbol(Symbol.from_tuple(row))
+
+            edge_rows = _tuple_cursor(
+                conn,
+                f"SELECT {_EDGE_COLUMNS} FROM edges WHERE {edge_column} IN ({placeholders})",
+                batch,
             )
-            graph.add_edge(edge)
+            for row in edge_rows:
+                edge = Edge.from_tuple(row)
+                graph.add_edge(edge)
+                next_id = edge.callee_id if direction == "callees" else edge.caller_id
+                if next_id not in visited:
+                    next_level.add(next_id)
 
-            next_id = edge.callee_id if direction == "callees" else edge.caller_id
-            if next_id not in visited:
-                queue.append((next_id, depth + 1))
+        level = next_level
+        depth += 1
 
     return graph
+
+
+def _tuple_cursor(
+    conn: sqlite3.Connection, sql: str, params: Sequence[object] = ()
+) -> sqlite3.Cursor:
+    """Execute a query on a cursor that yields plain tuples."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
+
+
+def _batched(ids: Sequence[int], size: int = _MAX_IN_PARAMS) -> Iterator[Sequence[int]]:
+    """Split ids into chunks that fit SQLite's bound-parameter limit."""
+    for i in range(0, len(ids), size):
+        yield ids[i : i + size]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from array import array
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
@@ -10,7 +11,7 @@ if TYPE_CHECKING:
     from decoder.core.models import Edge, Symbol
 
 
-@dataclass
+@dataclass(slots=True)
 class TreeNode:
     """A node in the call tree with full context."""
 
@@ -37,16 +38,18 @@ class TreeNode:
 
     def __iter__(self) -> Iterator[TreeNode]:
         """Pre-order traversal."""
-        yield self
-        for child in self.children:
-            yield from child
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
 
     def __len__(self) -> int:
-        """Total nodes in subtree."""
-        return 1 + sum(len(c) for c in self.children)
+        """Total nodes in subtree, counted with the iterative pre-order walk."""
+        return sum(1 for _ in self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Path:
     """A path through the call graph."""
 
@@ -62,3 +65,29 @@ class Path:
     def __repr__(self) -> str:
         names = " -> ".join(n.name for n in self.nodes)
         return f"Path({names})"
+
+
+@dataclass(slots=True, frozen=True)
+class CSRAdjacency:
+    """Compressed sparse row view of a graph's call edges.
+
+    Symbol ids are remapped to contiguous indices 0..n-1 (``ids[i]`` is the
+    symbol id of index ``i``). The callees of index ``u`` are
+    ``col_ind[row_ptr[u]:row_ptr[u + 1]]`` and ``edge_idx`` holds the matching
+    positions in the graph's edge list. Edges touching ids that are not symbol
+    nodes are left out.
+    """
+
+    ids: array[int]
+    index: dict[int, int]
+    row_ptr: array[int]
+    col_ind: array[int]
+    edge_idx: array[int]
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.ids)
+
+    def neighbors(self, u: int) -> array[int]:
+        """Callee indices of node index u."""
+        return self.col_ind[self.row_ptr[u] : self.row_ptr[u + 1]]
@@ -1,37 +1,43 @@
-"""Path finding algorithms: BFS shortest, DFS all paths."""
+"""Path finding algorithms: bidirectional BFS shortest, DFS all paths."""
 
 from __future__ import annotations
 
-from collections import deque
+from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
 from decoder.core.graph.models import Path
 
 if TYPE_CHECKING:
     from decoder.core.graph.base import CallGraph
-    from decoder.core.models import Edge
+    from decoder.core.models import Edge, Symbol
 
 
 def shortest_path(graph: CallGraph, from_id: int, to_id: int) -> Path | None:
-    """Find shortest path using BFS. O(V + E)."""
-    if from_id not in graph.symbols or to_id not in graph.symbols:
+    """Find shortest path using bidirectional BFS. O(V + E).
+
+    Searches forward along callees from from_id and backward along callers
+    from to_id, always expanding the smaller frontier by one full level, and
+    stops as soon as the two searches meet.
+    """
+    if from_id not in graph or to_id not in graph:
         return None
     if from_id == to_id:
-        return Path(nodes=[graph.symbols[from_id]], edges=[])
+        return Path(nodes=[graph[from_id]], edges=[])
+    if not graph._out.get(from_id) or not graph._in.get(to_id):
+        return None
 
-    queue: deque[int] = deque([from_id])
-    parent: dict[int, tuple[int, Edge]] = {}
-    visited: set[int] = {from_id}
+    fwd_parent: dict[int, tuple[int, Edge] | None] = {from_id: None}
+    bwd_parent: dict[int, tuple[int, Edge] | None] = {to_id: None}
+    fwd_frontier = [from_id]
+    bwd_frontier = [to_id]
 
-    while queue:
-        current = queue.popleft()
-        for callee_id, edge in graph._out.get(current, []):
-            if callee_id not in visited:
-                visited.add(callee_id)
-                parent[callee_id] = (current, edge)
-                if callee_id == to_id:
-                    return _reconstruct(graph, from_id, to_id, parent)
-                queue.append(callee_id)
+    while fwd_frontier and bwd_frontier:
+        if len(fwd_frontier) <= len(bwd_frontier):
+            fwd_frontier, meet = _expand_level(graph._out, fwd_frontier, fwd_parent, bwd_parent)
+        else:
+            bwd_frontier, meet = _expand_level(graph._in, bwd_frontier, bwd_parent, fwd_parent)
+        if meet is not None:
+            return _stitch(graph, meet, fwd_parent, bwd_parent)
 
     return None
 
@@ -45,60 +51,122 @@ def all_paths(
 ) -> list[Path]:
     """Find all paths using DFS with backtracking.
 
-    Limited by max_paths and max_depth to avoid explosion.
+    Limited by max_paths and max_depth to avoid explosion. A reverse BFS from
+    to_id first records how far each node is from the target, so the DFS
+    never enters a callee that cannot reach it within the remaining depth.
     """
-    if from_id not in graph.symbols or to_id not in graph.symbols:
+    if from_id not in graph or to_id not in graph:
         return []
+    if from_id == to_id:
+        return [Path(nodes=[graph[from_id]], edges=[])] if max_paths > 0 else []
 
+    dist = _distances_to(graph, to_id, max_depth)
+    if from_id not in dist:
+        return []
+
+    out = graph._out
+    empty = ()
     paths: list[Path] = []
-    current_nodes: list[int] = [from_id]
+    target = graph[to_id]
+    # Symbols are resolved once when pushed, so recording a path is two list copies
+    current_nodes: list[Symbol] = [graph[from_id]]
     current_edges: list[Edge] = []
     visited: set[int] = {from_id}
+    # One callee iterator per node on the current path
+    stack: list[Iterator[tuple[int, Edge]]] = [iter(out.get(from_id) or empty)]
+
+    while stack and len(paths) < max_paths:
+        depth = len(stack)  # depth of a callee of the node on top of the stack
+        for callee_id, edge in stack[-1]:
+            if callee_id in visited or depth + dist.get(callee_id, max_depth) > max_depth:
+                continue
+            if callee_id == to_id:
+                paths.append(Path(nodes=[*current_nodes, target], edges=[*current_edges, edge]))
+                if len(paths) >= max_paths:
+                    break
+                continue
+            symbol = graph.get_symbol(callee_id)
+            if symbol is None:
+                continue
+            visited.add(callee_id)
+            current_nodes.append(symbol)
+            current_edges.append(edge)
+            stack.append(iter(out.get(callee_id) or empty))
+            break
+        else:
+            stack.pop()
+            current_nodes.pop()
+            if current_edges:
+                visited.discard(current_edges.pop().callee_id)
 
-    def dfs(node_id: int, depth: int) -> None:
-        if len(paths) >= max_paths or depth > max_depth:
-            return
-
-        if node_id == to_id:
-            paths.append(
-                Path(
-                    nodes=[graph.symbols[n] for n in current_nodes],
-                    edges=list(current_edges),
-                )
-            )
-            return
-
-        for callee_id, edge in graph._out.get(node_id, []):
-            if callee_id not in visited:
-                visited.add(callee_id)
-                current_nodes.append(callee_id)
-                current_edges.append(edge)
-
-                dfs(callee_id, depth + 1)
-
-                current_nodes.pop()
-                current_edges.pop()
-                visited.remove(callee_id)
-
-    dfs(from_id, 0)
     return paths
 
 
-def _reconstruct(
-    graph: CallGraph, from_id: int, to_id: int, parent: dict[int, tuple[int, Edge]]
+def _distances_to(graph: CallGraph, to_id: int, max_depth: int) -> dict[int, int]:
+    """Hop distance to to_id for every node that reaches it within max_depth calls."""
+    dist = {to_id: 0}
+    frontier = [to_id]
+    for d in range(1, max_depth + 1):
+        next_frontier = []
+        for node_id in frontier:
+            for caller_id, _edge in graph._in.get(node_id) or ():
+                if caller_id not in dist:
+                    dist[caller_id] = d
+                    next_frontier.append(caller_id)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return dist
+
+
+def _expand_level(
+    adjacency: dict[int, list[tuple[int, Edge]]],
+    frontier: list[int],
+    parent: dict[int, tuple[int, Edge] | None],
+    other_parent: dict[int, tuple[int, Edge] | None],
+) -> tuple[list[int], int | None]:
+    """Expand one BFS level. Returns the next frontier and the meeting node, if any.
+
+    Levels are expanded whole, so the first node seen by both searches lies
+    on a shortest path.
+    """
+    next_frontier: list[int] = []
+    # Hot loop: bind lookups to locals
+    neighbors = adjacency.get
+    append = next_frontier.append
+    empty = ()
+    for node_id in frontier:
+        for neighbor_id, edge in neighbors(node_id) or empty:
+            if neighbor_id not in parent:
+                parent[neighbor_id] = (node_id, edge)
+                if neighbor_id in other_parent:
+                    return next_frontier, neighbor_id
+                append(neighbor_id)
+    return next_frontier, None
+
+
+def _stitch(
+    graph: CallGraph,
+    meet: int,
+    fwd_parent: dict[int, tuple[int, Edge] | None],
+    bwd_parent: dict[int, tuple[int, Edge] | None],
 ) -> Path:
-    """Reconstruct path from BFS parent map."""
-    nodes = []
-    edges = []
-    current = to_id
-
-    while current != from_id:
-        nodes.append(graph.symbols[current])
-        prev, edge = parent[current]
+    """Join the forward and backward BFS parent chains at the meeting node."""
+    node_ids = [meet]
+    edges: list[Edge] = []
+
+    current = meet
+    while (step := fwd_parent[current]) is not None:
+        current, edge = step
+        node_ids.append(current)
         edges.append(edge)
-        current = prev
-
-    nodes.append(graph.symbols[from_id])
-    nodes.reverse()
+    node_ids.reverse()
     edges.reverse()
-    return Path(nodes=nodes, edges=edges)
+
+    current = meet
+    while (step := bwd_parent[current]) is not None:
+        current, edge = step
+        node_ids.append(current)
+        edges.append(edge)
+
+    return Path(nodes=[graph[n] for n in node_ids], edges=edges)
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
 from typing import TYPE_CHECKING
 
 from decoder.core.graph.models import TreeNode
 
 if TYPE_CHECKING:
     from decoder.core.graph.base import CallGraph
-    from decoder.core.models import Edge
+    from decoder.core.models import Edge, Symbol
 
 
 def get_callee_tree(graph: CallGraph, root_id: int, max_depth: int = 10) -> TreeNode | None:
@@ -16,37 +17,7 @@ def get_callee_tree(graph: CallGraph, root_id: int, max_depth: int = 10) -> Tree
 
     DFS with cycle detection. O(V + E) in subgraph.
     """
-    if root_id not in graph.symbols:
-        return None
-
-    visited: set[int] = set()
-
-    def dfs(symbol_id: int, edge: Edge | None, depth: int) -> TreeNode | None:
-        if depth > max_depth or symbol_id in visited:
-            return None
-        if symbol_id not in graph.symbols:
-            return None
-
-        visited.add(symbol_id)
-        node = TreeNode(
-            symbol=graph.symbols[symbol_id],
-            edge=edge,
-            depth=depth,
-        )
-
-        callees = sorted(
-            graph._out.get(symbol_id, []),
-            key=lambda x: x[1].call_line,
-        )
-        for callee_id, callee_edge in callees:
-            child = dfs(callee_id, callee_edge, depth + 1)
-            if child:
-                node.children.append(child)
-
-        visited.remove(symbol_id)
-        return node
-
-    return dfs(root_id, None, 0)
+    return _build_tree(graph, root_id, graph._sorted_out, max_depth)
 
 
 def get_caller_tree(graph: CallGraph, root_id: int, max_depth: int = 10) -> TreeNode | None:
@@ -54,44 +25,100 @@ def get_caller_tree(graph: CallGraph, root_id: int, max_depth: int = 10) -> Tree
 
     DFS going backwards. O(V + E) in subgraph.
     """
-    if root_id not in graph.symbols:
+    return _build_tree(graph, root_id, graph._sorted_in, max_depth)
+
+
+def _build_tree(
+    graph: CallGraph,
+    root_id: int,
+    neighbors: Callable[[int], list[tuple[int, Edge]]],
+    max_depth: int,
+) -> TreeNode | None:
+    """Iterative DFS tree builder shared by the callee and caller trees.
+
+    Uses an explicit work stack of (symbol_id, edge, depth, parent, node)
+    entries: ``node`` is None when entering a symbol and set when leaving it,
+    which is when it is dropped from the on-path ``visited`` set.
+    """
+    if root_id not in graph:
         return None
 
     visited: set[int] = set()
+    root: TreeNode | None = None
+    stack: list[tuple[int, Edge | None, int, TreeNode | None, TreeNode | None]] = [
+        (root_id, None, 0, None, None)
+    ]
+
+    while stack:
+        symbol_id, edge, depth, parent, node = stack.pop()
 
-    def dfs(symbol_id: int, edge: Edge | None, depth: int) -> TreeNode | None:
-        if depth > max_depth or symbol_id in visited:
-            return None
-        if symbol_id not in graph.symbols:
-            return None
+        if node is not None:
+            visited.remove(symbol_id)
+            continue
+
+        if depth > max_depth or symbol_id in visited or symbol_id not in graph:
+            continue
 
         visited.add(symbol_id)
-        node = TreeNode(
-            symbol=graph.symbols[symbol_id],
-            edge=edge,
-            depth=depth,
-        )
+        node = TreeNode(symbol=graph[symbol_id], edge=edge, depth=depth)
+        if parent is None:
+            root = node
+        else:
+            parent.children.append(node)
+
+        stack.append((symbol_id, edge, depth, parent, node))
+        for next_id, next_edge in reversed(neighbors(symbol_id)):
+            stack.append((next_id, next_edge, depth + 1, node, None))
 
-        callers = sorted(
-            graph._in.get(symbol_id, []),
-            key=lambda x: x[1].call_line,
-        )
-        for caller_id, caller_edge in callers:
-            child = dfs(caller_id, caller_edge, depth + 1)
-            if child:
-                node.children.append(child)
+    return root
 
-        visited.remove(symbol_id)
-        return node
 
-    return dfs(root_id, None, 0)
+def iter_tree(
+    graph: CallGraph, root_id: int, direction: str = "callees", max_depth: int = 10
+) -> Iterator[tuple[int, Symbol, Edge | None, bool]]:
+    """Stream the callee or caller tree in pre-order without building TreeNodes.
+
+    Yields (depth, symbol, edge, is_last_sibling) for the same nodes, in the
+    same order, as get_callee_tree / get_caller_tree. Memory is O(depth * fanout).
+    """
+    if root_id not in graph:
+        return
+
+    neighbors = graph._sorted_out if direction == "callees" else graph._sorted_in
+    on_path: set[int] = {root_id}
+    path: list[int] = [root_id]
+
+    def children(symbol_id: int, depth: int) -> list[tuple[int, Edge]]:
+        if depth >= max_depth:
+            return []
+        return [
+            (nid, edge) for nid, edge in neighbors(symbol_id) if nid in graph and nid not in on_path
+        ]
+
+    yield 0, graph[root_id], None, True
+    stack: list[tuple[list[tuple[int, Edge]], int]] = [(children(root_id, 0), 0)]
+
+    while stack:
+        kids, i = stack[-1]
+        if i == len(kids):
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        stack[-1] = (kids, i + 1)
+        nid, edge = kids[i]
+        depth = len(path)
+        yield depth, graph[nid], edge, i == len(kids) - 1
+        on_path.add(nid)
+        path.append(nid)
+        stack.append((children(nid, depth), 0))
 
 
 def flatten_tree(root: TreeNode, include_root: bool = True) -> list[TreeNode]:
     """Flatten tree to list in pre-order. O(n)."""
     result: list[TreeNode] = []
-    if include_root:
-        result.append(root)
-    for child in root.children:
-        result.extend(flatten_tree(child, include_root=True))
+    stack = [root] if include_root else list(reversed(root.children))
+    while stack:
+        node = stack.pop()
+        result.append(node)
+        stack.extend(reversed(node.children))
     return result
@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
+import contextlib
 import fnmatch
-from collections.abc import Callable
+import functools
+import os
+import re
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
 from pathlib import Path
+from typing import Final
 
-from decoder.core.exceptions import ParseError, SymbolNotFoundError
+from decoder.core.exceptions import ParseError
 from decoder.core.models import IndexStats, SymbolType
+from decoder.core.parse_cache import ParseCache
 from decoder.core.storage import SymbolRepository, compute_file_hash
+from decoder.core.storage.edges import EdgeRow
+from decoder.core.storage.symbols import SymbolRow
 from decoder.languages import ParsedEdge, ParseResult, PythonParser
 
 ProgressCallback = Callable[[Path, int, int], None]
 
-_SELF_PREFIX = "self."
+_SELF_PREFIX: Final = "self."
 
 DEFAULT_EXCLUDES = [
     "__pycache__",
@@ -26,15 +36,32 @@ DEFAULT_EXCLUDES = [
 ]
 
 
+# Edge rows are resolved lazily and written this many at a time
+_STORAGE_BATCH_SIZE: Final = 1000
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_excludes(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Combine glob patterns into one compiled regex."""
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
 class Indexer:
     """Coordinates file parsing and symbol storage."""
 
-    def __init__(self, repo: SymbolRepository) -> None:
-        """Initialize with a symbol repository."""
+    def __init__(self, repo: SymbolRepository, parse_cache: ParseCache | None = None) -> None:
+        """Initialize with a symbol repository and an optional on-disk parse cache."""
         self._repo = repo
         self._parser = PythonParser()
+        self._parse_cache = parse_cache
 
         self._symbol_cache: dict[str, int] = {}
+        self._symbol_types: dict[str, SymbolType] = {}
+        # Stored symbols for callee names missing from _symbol_cache; see _resolve_edges
+        self._stored_ids: dict[str, int] = {}
+        self._enclosing_class_cache: dict[str, str | None] = {}
+        # (class name, method name) -> first symbol id; see _find_by_suffix
+        self._suffix_index: dict[tuple[str, str], int] | None = None
 
     def index_directory(
         self,
@@ -46,7 +73,7 @@ class Indexer:
         """Index all Python files in a directory.
 
         Uses a two-pass approach:
-        1. First pass: Parse all files and insert symbols
+        1. First pass: Parse all files (in parallel for larger trees) and insert symbols
         2. Second pass: Resolve and insert all edges
 
         This ensures cross-file references (e.g., typed parameter calls) resolve correctly
@@ -61,70 +88,66 @@ class Indexer:
         Returns:
             IndexStats with counts of files/symbols/edges processed
         """
-        all_excludes = DEFAULT_EXCLUDES + (exclude_patterns or [])
+        exclude_re = _compile_excludes((*DEFAULT_EXCLUDES, *(exclude_patterns or [])))
         stats = IndexStats()
+        self._enclosing_class_cache.clear()
+        self._suffix_index = None
 
-        python_files = list(directory.rglob("*.py"))
+        python_files = self._find_python_files(directory, exclude_re)
         total_files = len(python_files)
 
         parse_results: list[tuple[Path, ParseResult]] = []
+        to_parse: list[tuple[Path, os.stat_result, str]] = []
+        done = 0
 
-        for i, file in enumerate(python_files):
-            relative_path = str(file.relative_to(directory))
-            if self._should_exclude(relative_path, all_excludes):
+        for file, relative_path in python_files:
+            if self._should_exclude(file.name, relative_path, exclude_re):
                 stats.skipped += 1
-                if on_progress:
-                    on_progress(file, i + 1, total_files)
-                continue
-
-            if not force and not self._repo.files.needs_reindex(file):
+            else:
+                # Stat before hashing so a concurrent write is caught next run
+                changed = (
+                    (file.stat(), compute_file_hash(file))
+                    if force
+                    else self._repo.files.check_for_reindex(file)
+                )
+                if changed is not None:
+                    to_parse.append((file, *changed))
+                    continue
                 stats.unchanged += 1
+            done += 1
+            if on_progress:
+                on_progress(file, done, total_files)
+
+        # A fresh database gets its write-only indexes built once at the end
+        bulk = self._repo.bulk_load() if self._repo.is_empty() else contextlib.nullcontext()
+        with bulk:
+            # Parsing runs in worker processes; all database writes stay here
+            results = self._parse_with_cache([(file, file_hash) for file, _, file_hash in to_parse])
+            for (file, stat, file_hash), result in zip(to_parse, results, strict=True):
+                with self._repo.transaction():
+                    self._repo.edges.delete_for_file(file)
+                    self._repo.symbols.delete_in_file(file)
+
+                    if isinstance(result, ParseError):
+                        stats.errors.append(str(result))
+                    else:
+                        stats.symbols += self._insert_symbols(result)
+                        self._repo.files.upsert(file, file_hash, stat)
+
+                        parse_results.append((file, result))
+                        stats.files += 1
+
+                done += 1
                 if on_progress:
-                    on_progress(file, i + 1, total_files)
-                continue
-
-            try:
-                self._repo.edges.delete_for_file(file)
-                self._repo.symbols.delete_in_file(file)
-
-                result = self._parser.parse(file)
-                for parsed_symbol in result.symbols:
-                    symbol_id = self._repo.symbols.insert(
-                        name=parsed_symbol.name,
-                        qualified_name=parsed_symbol.qualified_name,
-                        file=parsed_symbol.file,
-                        line=parsed_symbol.line,
-                        symbol_type=parsed_symbol.type,
-                        end_line=parsed_symbol.end_line,
-                        parent_id=self._get_parent_id(parsed_symbol.parent_qualified_name),
-                    )
-                    self._symbol_cache[parsed_symbol.qualified_name] = symbol_id
-                    stats.symbols += 1
-
-                file_hash = compute_file_hash(file)
-                self._repo.files.upsert(file, file_hash)
-
-                parse_results.append((file, result))
-                stats.files += 1
-
-            except ParseError as e:
-                stats.errors.append(str(e))
+                    on_progress(file, done, total_files)
 
-            if on_progress:
-                on_progress(file, i + 1, total_files)
-
-        for file, result in parse_results:
-            for parsed_edge in result.edges:
-                callee_id = self._resolve_callee(
-                    parsed_edge.callee_name,
-                    parsed_edge.caller_qualified_name,
-                    result,
+            with self._repo.transaction():
+                stats.edges += self._insert_edges(
+                    self._resolve_edges([result for _file, result in parse_results])
                 )
-                if callee_id is not None:
-                    caller_id = self._symbol_cache.get(parsed_edge.caller_qualified_name)
-                    if caller_id is not None:
-                        self._insert_edge(caller_id, callee_id, parsed_edge)
-                        stats.edges += 1
+
+        if self._parse_cache is not None:
+            self._parse_cache.prune()
 
         return stats
 
@@ -136,59 +159,84 @@ class Indexer:
         """
         stats = IndexStats()
         stats.files = 1
+        self._enclosing_class_cache.clear()
+        self._suffix_index = None
 
-        self._repo.edges.delete_for_file(file)
-        self._repo.symbols.delete_in_file(file)
-
-        result = self._parser.parse(file)
+        stat = file.stat()
+        file_hash = compute_file_hash(file)
+        result = self._parse_cache.get(file, file_hash) if self._parse_cache else None
+        if result is None:
+            result = self._parser.parse(file)
+            if self._parse_cache is not None:
+                self._parse_cache.put(file, file_hash, result)
 
-        for parsed_symbol in result.symbols:
-            symbol_id = self._repo.symbols.insert(
-                name=parsed_symbol.name,
-                qualified_name=parsed_symbol.qualified_name,
-                file=parsed_symbol.file,
-                line=parsed_symbol.line,
-                symbol_type=parsed_symbol.type,
-                end_line=parsed_symbol.end_line,
-                parent_id=self._get_parent_id(parsed_symbol.parent_qualified_name),
-            )
-            self._symbol_cache[parsed_symbol.qualified_name] = symbol_id
-            stats.symbols += 1
+        with self._repo.transaction():
+            self._repo.edges.delete_for_file(file)
+            self._repo.symbols.delete_in_file(file)
+            stats.symbols = self._insert_symbols(result)
 
-        for parsed_edge in result.edges:
-            callee_id = self._resolve_callee(
-                parsed_edge.callee_name,
-                parsed_edge.caller_qualified_name,
-                result,
-            )
-            if callee_id is not None:
-                caller_id = self._symbol_cache.get(parsed_edge.caller_qualified_name)
-                if caller_id is not None:
-                    self._insert_edge(caller_id, callee_id, parsed_edge)
-                    stats.edges += 1
+            stats.edges = self._insert_edges(self._resolve_edges([result]))
 
-        file_hash = compute_file_hash(file)
-        self._repo.files.upsert(file, file_hash)
+            self._repo.files.upsert(file, file_hash, stat)
 
         return stats
 
-    def _should_exclude(self, path: str, patterns: list[str]) -> bool:
-        """Check if a path matches any exclusion pattern.
+    def _parse_with_cache(
+        self, files: list[tuple[Path, str]]
+    ) -> Iterator[ParseResult | ParseError]:
+        """Parse (file, content hash) pairs in order, serving hits from the parse cache."""
+        if self._parse_cache is None:
+            yield from self._parser.parse_many([file for file, _ in files])
+            return
+
+        cached = [self._parse_cache.get(file, file_hash) for file, file_hash in files]
+        misses = self._parser.parse_many(
+            [file for (file, _), hit in zip(files, cached) if hit is None]
+        )
+        for (file, file_hash), hit in zip(files, cached):
+            if hit is not None:
+                yield hit
+                continue
+            result = next(misses)
+            if not isinstance(result, ParseError):
+                self._parse_cache.put(file, file_hash, result)
+            yield result
+        misses.close()  # shut the worker pool down now rather than at GC
+
+    def _find_python_files(
+        self, directory: Path, exclude_re: re.Pattern[str]
+    ) -> list[tuple[Path, str]]:
+        """List Python files under a directory with their relative POSIX paths.
+
+        Excluded directories are pruned before descent, so nothing inside
+        __pycache__, node_modules, venvs, etc. is ever listed.
+        """
+        files: list[tuple[Path, str]] = []
+        for root, dirs, names in os.walk(directory):
+            rel_root = Path(root).relative_to(directory).as_posix()
+            prefix = "" if rel_root == "." else f"{rel_root}/"
+            dirs[:] = sorted(d for d in dirs if not self._should_exclude(d, prefix + d, exclude_re))
+            files.extend(
+                (Path(root, name), prefix + name) for name in sorted(names) if name.endswith(".py")
+            )
+        return files
+
+    def _should_exclude(self, name: str, relative_path: str, exclude_re: re.Pattern[str]) -> bool:
+        """Check if a file or directory matches an exclusion pattern.
 
         Excludes:
-        - Any path component starting with '.' (hidden files/directories)
-        - Any path component matching the exclusion patterns
+        - Hidden files and directories (name starting with '.')
+        - Names matching the exclusion patterns (e.g., "__pycache__")
+        - Relative paths matching the exclusion patterns (e.g., "tests/*")
+
+        Parent directories are checked while walking, so only the last
+        path component needs testing here.
         """
-        parts = Path(path).parts
-        for part in parts:
-            # Skip hidden files and directories
-            if part.startswith("."):
-                return True
-            # Check against exclusion patterns
-            for pattern in patterns:
-                if fnmatch.fnmatch(part, pattern):
-                    return True
-        return False
+        return (
+            name.startswith(".")
+            or exclude_re.match(name) is not None
+            or exclude_re.match(relative_path) is not None
+        )
 
     def _get_parent_id(self, parent_qualified_name: str | None) -> int | None:
         """Get the ID of a parent symbol."""
@@ -196,19 +244,100 @@ class Indexer:
             return None
         return self._symbol_cache.get(parent_qualified_name)
 
-    def _insert_edge(self, caller_id: int, callee_id: int, parsed_edge: ParsedEdge) -> None:
-        """Insert an edge with context information."""
+    def _insert_symbols(self, result: ParseResult) -> int:
+        """Insert a file's symbols in one batch and cache their IDs.
+
+        IDs are assigned here rather than by SQLite so parent_id can point at
+        symbols from the same batch. Returns the number of symbols inserted.
+        """
+        next_id = self._repo.symbols.next_id()
+        rows: list[SymbolRow] = []
+        # First (lowest-id) type per name, matching the MIN(id) the storage
+        # lookups use, so a class rebound later in the module stays a class
+        types: dict[str, SymbolType] = {}
+        for symbol_id, parsed_symbol in enumerate(result.symbols, next_id):
+            # Interned so resolver lookups with interned keys hit on identity
+            qualified_name = sys.intern(parsed_symbol.qualified_name)
+            rows.append(
+                (
+                    symbol_id,
+                    parsed_symbol.name,
+                    qualified_name,
+                    str(parsed_symbol.file),
+                    parsed_symbol.line,
+                    parsed_symbol.end_line,
+                    parsed_symbol.type.value,
+                    self._get_parent_id(parsed_symbol.parent_qualified_name),
+                )
+            )
+            self._symbol_cache[qualified_name] = symbol_id
+            types.setdefault(qualified_name, parsed_symbol.type)
+        self._symbol_types.update(types)
+        self._repo.symbols.insert_many(rows)
+        return len(rows)
+
+    def _insert_edges(self, rows: Iterable[EdgeRow]) -> int:
+        """Insert edge rows in bounded batches. Returns the number stored.
+
+        Duplicates of an already stored edge are dropped by the unique index,
+        so they are not counted.
+        """
+        rows = iter(rows)
+        count = 0
+        while batch := list(islice(rows, _STORAGE_BATCH_SIZE)):
+            count += self._repo.edges.insert_many(batch)
+        return count
+
+    def _resolve_edges(self, results: list[ParseResult]) -> Iterator[EdgeRow]:
+        """Resolve parsed edges to rows ready for EdgeStorage.insert_many."""
+        # Callee names the cache can't answer are looked up in one set-based
+        # query rather than one query per edge.
+        self._stored_ids = self._repo.symbols.ids_by_qualified_name(
+            {
+                edge.callee_name
+                for result in results
+                for edge in result.edges
+                if edge.callee_name not in self._symbol_cache
+            }
+        )
+        for result in results:
+            yield from self._resolve_file_edges(result)
+
+    def _resolve_file_edges(self, result: ParseResult) -> Iterator[EdgeRow]:
+        """Resolve one file's parsed edges."""
+        intern = sys.intern
+        # Repeated calls from the same caller resolve identically within a file
+        # (imports and typed vars are file-scoped), so resolve each pair once.
+        resolved: dict[tuple[str, str], int | None] = {}
+        for parsed_edge in result.edges:
+            caller_qualified_name = intern(parsed_edge.caller_qualified_name)
+            callee_name = intern(parsed_edge.callee_name)
+            key = (callee_name, caller_qualified_name)
+            if key in resolved:
+                callee_id = resolved[key]
+            else:
+                callee_id = resolved[key] = self._resolve_callee(
+                    callee_name, caller_qualified_name, result
+                )
+            if callee_id is None:
+                continue
+            caller_id = self._symbol_cache.get(caller_qualified_name)
+            if caller_id is not None:
+                yield self._edge_row(caller_id, callee_id, parsed_edge)
+
+    def _edge_row(self, caller_id: int, callee_id: int, parsed_edge: ParsedEdge) -> EdgeRow:
+        """Build an edge row with context information."""
         ctx = parsed_edge.context
-        self._repo.edges.insert(
-            caller_id=caller_id,
-            callee_id=callee_id,
-            call_line=parsed_edge.call_line,
-            call_type=parsed_edge.call_type,
-            is_conditional=ctx.is_conditional if ctx else False,
-            condition=ctx.condition if ctx else None,
-            is_loop=ctx.is_loop if ctx else False,
-            is_try_block=ctx.is_try_block if ctx else False,
-            is_except_handler=ctx.is_except_handler if ctx else False,
+        return (
+            caller_id,
+            callee_id,
+            parsed_edge.call_line,
+            parsed_edge.call_type.value,
+            int(ctx.is_conditional) if ctx else 0,
+            ctx.condition if ctx else None,
+            int(ctx.is_loop) if ctx else 0,
+            int(ctx.is_try_block) if ctx else 0,
+            int(ctx.is_except_handler) if ctx else 0,
         )
 
     def _resolve_callee(
@@ -260,13 +389,7 @@ class Indexer:
             if resolved_name in self._symbol_cache:
                 return self._symbol_cache[resolved_name]
 
-        try:
-            symbol = self._repo.symbols.get_by_qualified_name(callee_name)
-            return symbol.id
-        except SymbolNotFoundError:
-            pass
-
-        return None
+        return self._stored_ids.get(callee_name)
 
     def _resolve_instance_var_call(
         self,
@@ -298,11 +421,7 @@ class Indexer:
         if not class_name:
             return None
 
-        var_type = None
-        for tv in parse_result.typed_vars:
-            if tv.name == attr_name and tv.scope_qualified_name == class_name:
-                var_type = tv.type_name
-                break
+        var_type = parse_result.typed_vars_index.get((class_name, attr_name))
 
         if not var_type:
             return None
@@ -315,17 +434,11 @@ class Indexer:
         if method_qualified in self._symbol_cache:
             return self._symbol_cache[method_qualified]
 
-        try:
-            symbol = self._repo.symbols.get_by_qualified_name(method_qualified)
-            return symbol.id
-        except SymbolNotFoundError:
-            pass
+        symbol_id = self._repo.symbols.id_by_qualified_name(method_qualified)
+        if symbol_id is not None:
+            return symbol_id
 
-        for s in self._repo.symbols.find(method_name):
-            if s.qualified_name.endswith(f".{var_type}.{method_name}"):
-                return s.id
-
-        return None
+        return self._find_by_suffix(var_type, method_name)
 
     def _resolve_typed_call(
         self,
@@ -352,11 +465,7 @@ class Indexer:
 
         var_name, method_name = parts
 
-        var_type = None
-        for tv in parse_result.typed_vars:
-            if tv.name == var_name and tv.scope_qualified_name == caller_qualified_name:
-                var_type = tv.type_name
-                break
+        var_type = parse_result.typed_vars_index.get((caller_qualified_name, var_name))
 
         if not var_type:
             return None
@@ -369,31 +478,46 @@ class Indexer:
         if method_qualified in self._symbol_cache:
             return self._symbol_cache[method_qualified]
 
-        try:
-            symbol = self._repo.symbols.get_by_qualified_name(method_qualified)
-            return symbol.id
-        except SymbolNotFoundError:
-            pass
+        symbol_id = self._repo.symbols.id_by_qualified_name(method_qualified)
+        if symbol_id is not None:
+            return symbol_id
 
-        for s in self._repo.symbols.find(method_name):
-            if s.qualified_name.endswith(f".{var_type}.{method_name}"):
-                return s.id
+        return self._find_by_suffix(var_type, method_name)
 
-        return None
+    def _find_by_suffix(self, class_name: str, method_name: str) -> int | None:
+        """Find a symbol whose qualified name ends with ".{class_name}.{method_name}".
 
-    def _get_enclosing_class(self, qualified_name: str) -> str | None:
-        """Get the enclosing class name from a qualified name."""
-        parts = qualified_name.rsplit(".", 1)
-        if len(parts) < 2:
+        Dotless names are looked up in an index over every stored symbol,
+        built once per run on first use; dotted ones fall back to a search.
+        """
+        if "." in class_name or "." in method_name:
+            for s in self._repo.symbols.find(method_name):
+                if s.qualified_name.endswith(f".{class_name}.{method_name}"):
+                    return s.id
             return None
 
-        parent = parts[0]
-        if parent in self._symbol_cache:
-            try:
-                symbol = self._repo.symbols.get_by_qualified_name(parent)
-                if symbol.type == SymbolType.CLASS:
-                    return parent
-            except SymbolNotFoundError:
-                pass
+        if self._suffix_index is None:
+            self._suffix_index = {}
+            for symbol_id, qualified_name in self._repo.symbols.iter_qualified_names():
+                parts = qualified_name.rsplit(".", 2)
+                if len(parts) == 3:
+                    self._suffix_index.setdefault((parts[1], parts[2]), symbol_id)
+        return self._suffix_index.get((class_name, method_name))
+
+    def _get_enclosing_class(self, qualified_name: str) -> str | None:
+        """Get the enclosing class name from a qualified name (memoized per run)."""
+        try:
+            return self._enclosing_class_cache[qualified_name]
+        except KeyError:
+            pass
+
+        class_name = None
+        parent = qualified_name
+        while "." in parent:
+            parent = parent.rsplit(".", 1)[0]
+            if self._symbol_types.get(parent) is SymbolType.CLASS:
+                class_name = parent
+                break
 
-        return self._get_enclosing_class(parent)
+        self._enclosing_class_cache[qualified_name] = class_name
+        return class_name
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import functools
 import sqlite3
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from typing import Any
 
 
 class SymbolType(Enum):
@@ -27,7 +30,16 @@ class EdgeType(Enum):
     ATTRIBUTE = "attribute"
 
 
-@dataclass
+# Plain dict lookups bypass Enum.__call__ when decoding stored values.
+SYMBOL_TYPE_BY_VALUE = {t.value: t for t in SymbolType}
+EDGE_TYPE_BY_VALUE = {t.value: t for t in EdgeType}
+
+# Rows from one query mostly share a handful of files; Paths are immutable,
+# so reuse one per string instead of re-parsing it for every row.
+path_for: Callable[[str], Path] = functools.lru_cache(maxsize=4096)(Path)
+
+
+@dataclass(slots=True)
 class Symbol:
     """A code symbol (function, class, method, or variable)."""
 
@@ -47,15 +59,33 @@ class Symbol:
             id=row["id"],
             name=row["name"],
             qualified_name=row["qualified_name"],
-            file=Path(row["file"]),
+            file=path_for(row["file"]),
             line=row["line"],
             end_line=row["end_line"],
-            type=SymbolType(row["type"]),
+            type=SYMBOL_TYPE_BY_VALUE[row["type"]],
             parent_id=row["parent_id"],
         )
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> Symbol:
+        """Create a Symbol from a positional row.
+
+        Columns: id, name, qualified_name, file, line, end_line, type, parent_id.
+        """
+        sid, name, qualified_name, file, line, end_line, symbol_type, parent_id = row
+        return cls(
+            sid,
+            name,
+            qualified_name,
+            path_for(file),
+            line,
+            end_line,
+            SYMBOL_TYPE_BY_VALUE[symbol_type],
+            parent_id,
+        )
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Edge:
     """A relationship between two symbols."""
 
@@ -73,30 +103,54 @@ class Edge:
 
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> Edge:
-        """Create an Edge from a database row."""
+        """Create an Edge from a database row (context columns optional)."""
+        keys = row.keys()
         return cls(
             id=row["id"],
             caller_id=row["caller_id"],
             callee_id=row["callee_id"],
             call_line=row["call_line"],
-            call_type=EdgeType(row["call_type"]),
-            is_conditional=bool(row["is_conditional"]) if "is_conditional" in row.keys() else False,
-            condition=row["condition"] if "condition" in row.keys() else None,
-            is_loop=bool(row["is_loop"]) if "is_loop" in row.keys() else False,
-            is_try_block=bool(row["is_try_block"]) if "is_try_block" in row.keys() else False,
+            call_type=EDGE_TYPE_BY_VALUE[row["call_type"]],
+            is_conditional=bool(row["is_conditional"]) if "is_conditional" in keys else False,
+            condition=row["condition"] if "condition" in keys else None,
+            is_loop=bool(row["is_loop"]) if "is_loop" in keys else False,
+            is_try_block=bool(row["is_try_block"]) if "is_try_block" in keys else False,
             is_except_handler=(
-                bool(row["is_except_handler"]) if "is_except_handler" in row.keys() else False
+                bool(row["is_except_handler"]) if "is_except_handler" in keys else False
             ),
         )
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> Edge:
+        """Create an Edge from a positional row.
+
+        Columns: id, caller_id, callee_id, call_line, call_type, is_conditional,
+        condition, is_loop, is_try_block, is_except_handler.
+        """
+        eid, caller_id, callee_id, call_line, call_type, ic, condition, il, itb, ieh = row
+        return cls(
+            eid,
+            caller_id,
+            callee_id,
+            call_line,
+            EDGE_TYPE_BY_VALUE[call_type],
+            bool(ic),
+            condition,
+            bool(il),
+            bool(itb),
+            bool(ieh),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class FileRecord:
     """A record of an indexed file."""
 
     path: Path
     hash: str
     indexed_at: datetime
+    mtime_ns: int | None = None
+    size: int | None = None
 
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> FileRecord:
@@ -105,19 +159,31 @@ class FileRecord:
             path=Path(row["path"]),
             hash=row["hash"],
             indexed_at=datetime.fromisoformat(row["indexed_at"]),
+            mtime_ns=row["mtime_ns"],
+            size=row["size"],
         )
 
 
+@dataclass(slots=True, repr=False)
 class IndexStats:
     """Statistics from an indexing operation."""
 
-    def __init__(self) -> None:
-        self.files: int = 0
-        self.symbols: int = 0
-        self.edges: int = 0
-        self.skipped: int = 0
-        self.unchanged: int = 0
-        self.errors: list[str] = []
+    files: int = 0
+    symbols: int = 0
+    edges: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def __iadd__(self, other: IndexStats) -> IndexStats:
+        """Merge another run's counts into this one."""
+        self.files += other.files
+        self.symbols += other.symbols
+        self.edges += other.edges
+        self.skipped += other.skipped
+        self.unchanged += other.unchanged
+        self.errors.extend(other.errors)
+        return self
 
     def __repr__(self) -> str:
         return (
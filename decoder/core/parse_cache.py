@@ -0,0 +1,122 @@
+"""On-disk cache of parse results keyed by file path and content hash."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from decoder.core.models import EDGE_TYPE_BY_VALUE, SYMBOL_TYPE_BY_VALUE, path_for
+from decoder.languages import ParsedEdge, ParsedSymbol, ParseResult
+from decoder.languages.models import CallContext, TypedVar
+
+# Bump when parser output changes so stale entries stop matching
+_CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 20_000
+
+
+class ParseCache:
+    """Stores ParseResults as JSON files, one per (path, content hash).
+
+    The path is part of the key because qualified names are derived from it.
+    Entries are plain JSON rather than pickles, since the cache directory
+    lives inside the indexed project.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._directory = directory
+        self._max_entries = max_entries
+
+    def get(self, file: Path, content_hash: str) -> ParseResult | None:
+        """Return the cached result, or None on a miss or unreadable entry."""
+        entry = self._entry_path(file, content_hash)
+        try:
+            data = json.loads(entry.read_bytes())
+            result = _decode(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        # Refresh mtime so prune() evicts least recently used entries first
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return result
+
+    def put(self, file: Path, content_hash: str, result: ParseResult) -> None:
+        """Store a result. Failures to write are ignored; the cache is best-effort."""
+        entry = self._entry_path(file, content_hash)
+        tmp = entry.with_suffix(".tmp")
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(asdict(result), default=_encode_value))
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def prune(self) -> int:
+        """Delete least recently used entries beyond max_entries. Returns count deleted."""
+        try:
+            entries = [(e.stat().st_mtime_ns, e) for e in self._directory.glob("*.json")]
+        except OSError:
+            return 0
+        excess = len(entries) - self._max_entries
+        if excess <= 0:
+            return 0
+        entries.sort()
+        for _mtime, entry in entries[:excess]:
+            entry.unlink(missing_ok=True)
+        return excess
+
+    def _entry_path(self, file: Path, content_hash: str) -> Path:
+        key = hashlib.sha256(f"{_CACHE_VERSION}\0{file}\0{content_hash}".encode()).hexdigest()
+        return self._directory / f"{key[:32]}.json"
+
+
+def _encode_value(value: object) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _decode(data: dict[str, Any]) -> ParseResult:
+    typed_vars = data["typed_vars"]
+    return ParseResult(
+        file=path_for(data["file"]),
+        symbols=[
+            ParsedSymbol(
+                name=s["name"],
+                qualified_name=s["qualified_name"],
+                # One shared Path per file, as the parser produces, so
+                # str(file) is computed once rather than per symbol
+                file=path_for(s["file"]),
+                line=s["line"],
+                end_line=s["end_line"],
+                type=SYMBOL_TYPE_BY_VALUE[s["type"]],
+                parent_qualified_name=s["parent_qualified_name"],
+            )
+            for s in data["symbols"]
+        ],
+        edges=[
+            ParsedEdge(
+                caller_qualified_name=e["caller_qualified_name"],
+                callee_name=e["callee_name"],
+                call_line=e["call_line"],
+                call_type=EDGE_TYPE_BY_VALUE[e["call_type"]],
+                is_self_call=e["is_self_call"],
+                is_attribute=e["is_attribute"],
+                import_source=e["import_source"],
+                context=CallContext(**e["context"]) if e["context"] is not None else None,
+            )
+            for e in data["edges"]
+        ],
+        imports=data["imports"],
+        star_imports=data["star_imports"],
+        typed_vars=[TypedVar(**tv) for tv in typed_vars] if typed_vars is not None else None,
+    )
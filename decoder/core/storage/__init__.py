@@ -12,7 +12,8 @@ Components:
 Database Schema:
     symbols: id, name, qualified_name, file, line, end_line, type, parent_id
     edges: id, caller_id, callee_id, call_line, call_type, context flags
-    files: path, hash, indexed_at
+    files: path, hash, indexed_at, mtime_ns, size
+    symbols_fts: trigram index over symbols.name, maintained by triggers
 
 The database is stored at .decoder/index.db relative to the project root.
 """
@@ -20,11 +21,12 @@ The database is stored at .decoder/index.db relative to the project root.
 from decoder.core.storage.edges import EdgeStorage
 from decoder.core.storage.files import FileStorage, compute_file_hash
 from decoder.core.storage.repository import SymbolRepository, get_default_db_path
-from decoder.core.storage.symbols import SymbolStorage
+from decoder.core.storage.symbols import SYMBOL_COLUMNS, SymbolStorage
 
 __all__ = [
     "SymbolRepository",
     "SymbolStorage",
+    "SYMBOL_COLUMNS",
     "EdgeStorage",
     "FileStorage",
     "compute_file_hash",
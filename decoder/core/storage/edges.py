@@ -3,17 +3,54 @@
 from __future__ import annotations
 
 import sqlite3
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
+from typing import Final
 
 from decoder.core.models import Edge, EdgeType, Symbol
 
+# Rows pulled per fetchmany() when streaming caller/callee pairs
+_FETCH_SIZE = 1000
+
+# Each id is bound twice per query; stay under SQLite's 999-parameter floor.
+_MAX_IDS_PER_QUERY = 400
+
+# Symbol columns then Edge columns, in Symbol.from_tuple / Edge.from_tuple order
+_PAIR_COLUMNS = (
+    "s.id, s.name, s.qualified_name, s.file, s.line, s.end_line, s.type, s.parent_id, "
+    "e.id, e.caller_id, e.callee_id, e.call_line, e.call_type, "
+    "e.is_conditional, e.condition, e.is_loop, e.is_try_block, e.is_except_handler"
+)
+
+# Duplicate call sites hit idx_edges_unique and are skipped
+_INSERT_EDGE_SQL: Final = (
+    "INSERT OR IGNORE INTO edges (caller_id, callee_id, call_line, call_type, "
+    "is_conditional, condition, is_loop, is_try_block, is_except_handler) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Materialize the file's symbol ids once; both IN lists scan the result. The
+# MATERIALIZED hint needs SQLite 3.35; older versions get the plain CTE.
+_DELETE_FOR_FILE_SQL: Final = f"""
+WITH ids AS {"MATERIALIZED" if sqlite3.sqlite_version_info >= (3, 35) else ""} (
+    SELECT id FROM symbols WHERE file = ?
+)
+DELETE FROM edges WHERE caller_id IN ids OR callee_id IN ids
+"""
+
+EdgeRow = tuple[int, int, int, str, int, str | None, int, int, int]
+
 
 class EdgeStorage:
     """Storage operations for edges (relationships between symbols)."""
 
-    def __init__(self, get_connection: Callable[[], sqlite3.Connection]) -> None:
+    def __init__(
+        self,
+        get_connection: Callable[[], sqlite3.Connection],
+        commit: Callable[[], None] | None = None,
+    ) -> None:
         self._get_connection = get_connection
+        self._commit = commit or (lambda: get_connection().commit())
 
     def insert(
         self,
@@ -27,14 +64,11 @@ class EdgeStorage:
         is_try_block: bool = False,
         is_except_handler: bool = False,
     ) -> int:
-        """Insert an edge and return its ID."""
+        """Insert an edge and return its ID, or the existing edge's ID if it's a duplicate."""
         conn = self._get_connection()
+        # lastrowid rather than RETURNING, which needs SQLite 3.35
         cursor = conn.execute(
-            """
-            INSERT INTO edges (caller_id, callee_id, call_line, call_type,
-                              is_conditional, condition, is_loop, is_try_block, is_except_handler)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_EDGE_SQL,
             (
                 caller_id,
                 callee_id,
@@ -47,78 +81,195 @@ class EdgeStorage:
                 int(is_except_handler),
             ),
         )
-        conn.commit()
-        return cursor.lastrowid  # type: ignore[return-value]
+        if cursor.rowcount == 1:
+            edge_id = cursor.lastrowid
+        else:
+            (edge_id,) = conn.execute(
+                """
+                SELECT id FROM edges
+                WHERE caller_id = ? AND callee_id = ? AND call_line = ? AND call_type = ?
+                """,
+                (caller_id, callee_id, call_line, call_type.value),
+            ).fetchone()
+        self._commit()
+        return int(edge_id)  # type: ignore[arg-type]
+
+    def insert_many(self, rows: Iterable[EdgeRow]) -> int:
+        """Insert edges in one transaction. Returns the number actually stored.
+
+        Rows are (caller_id, callee_id, call_line, call_type, is_conditional,
+        condition, is_loop, is_try_block, is_except_handler). Rows duplicating
+        an existing edge are ignored and not counted.
+        """
+        conn = self._get_connection()
+        inserted = conn.executemany(_INSERT_EDGE_SQL, rows).rowcount
+        self._commit()
+        return inserted
 
     def get_callees(self, symbol_id: int) -> list[tuple[Symbol, Edge]]:
         """Get all symbols that this symbol calls (downstream)."""
+        return list(self.iter_callees(symbol_id))
+
+    def get_callers(self, symbol_id: int) -> list[tuple[Symbol, Edge]]:
+        """Get all symbols that call this symbol (upstream)."""
+        return list(self.iter_callers(symbol_id))
+
+    def iter_callees(self, symbol_id: int) -> Iterator[tuple[Symbol, Edge]]:
+        """Like get_callees, but stream rows in batches instead of building a list."""
         conn = self._get_connection()
-        cursor = conn.execute(
-            """
-            SELECT s.*, e.id as edge_id, e.caller_id, e.callee_id, e.call_line, e.call_type,
-                   e.is_conditional, e.condition, e.is_loop, e.is_try_block, e.is_except_handler
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"""
+            SELECT {_PAIR_COLUMNS}
             FROM symbols s
             JOIN edges e ON s.id = e.callee_id
             WHERE e.caller_id = ?
-            GROUP BY e.callee_id, e.call_line
-            ORDER BY e.call_line
+            ORDER BY e.call_line, e.callee_id, e.id
             """,
             (symbol_id,),
         )
-        return self._rows_to_symbol_edge_pairs(cursor.fetchall())
+        return _iter_symbol_edge_pairs(cursor)
 
-    def get_callers(self, symbol_id: int) -> list[tuple[Symbol, Edge]]:
-        """Get all symbols that call this symbol (upstream)."""
+    def iter_callers(self, symbol_id: int) -> Iterator[tuple[Symbol, Edge]]:
+        """Like get_callers, but stream rows in batches instead of building a list."""
         conn = self._get_connection()
-        cursor = conn.execute(
-            """
-            SELECT s.*, e.id as edge_id, e.caller_id, e.callee_id, e.call_line, e.call_type,
-                   e.is_conditional, e.condition, e.is_loop, e.is_try_block, e.is_except_handler
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"""
+            SELECT {_PAIR_COLUMNS}
             FROM symbols s
             JOIN edges e ON s.id = e.caller_id
             WHERE e.callee_id = ?
-            GROUP BY e.caller_id, e.call_line
-            ORDER BY s.file, e.call_line
+            ORDER BY s.file, e.call_line, e.caller_id, e.id
             """,
             (symbol_id,),
         )
-        return self._rows_to_symbol_edge_pairs(cursor.fetchall())
+        return _iter_symbol_edge_pairs(cursor)
 
-    def delete_for_file(self, file: Path) -> int:
-        """Delete all edges involving symbols in a file."""
-        conn = self._get_connection()
-        cursor = conn.execute(
+    def get_callees_many(self, symbol_ids: Sequence[int]) -> dict[int, list[tuple[Symbol, Edge]]]:
+        """get_callees for several symbols, in one query per batch of IDs.
+
+        Every requested ID gets an entry, empty if the symbol calls nothing.
+        """
+        return self._get_pairs_many(
+            symbol_ids,
             """
-            DELETE FROM edges WHERE caller_id IN (SELECT id FROM symbols WHERE file = ?)
-            OR callee_id IN (SELECT id FROM symbols WHERE file = ?)
+            SELECT {columns}
+            FROM symbols s
+            JOIN edges e ON s.id = e.callee_id
+            WHERE e.caller_id IN ({placeholders})
+            ORDER BY e.caller_id, e.call_line, e.callee_id, e.id
             """,
-            (str(file), str(file)),
+            group_column=9,
         )
-        conn.commit()
-        return cursor.rowcount
+
+    def get_callers_many(self, symbol_ids: Sequence[int]) -> dict[int, list[tuple[Symbol, Edge]]]:
+        """get_callers for several symbols, in one query per batch of IDs.
+
+        Every requested ID gets an entry, empty if nothing calls the symbol.
+        """
+        return self._get_pairs_many(
+            symbol_ids,
+            """
+            SELECT {columns}
+            FROM symbols s
+            JOIN edges e ON s.id = e.caller_id
+            WHERE e.callee_id IN ({placeholders})
+            ORDER BY e.callee_id, s.file, e.call_line, e.caller_id, e.id
+            """,
+            group_column=10,
+        )
+
+    def _get_pairs_many(
+        self, symbol_ids: Sequence[int], sql: str, group_column: int
+    ) -> dict[int, list[tuple[Symbol, Edge]]]:
+        """Run a grouped pair query over batches of IDs.
+
+        ``group_column`` is the _PAIR_COLUMNS index of the requested ID.
+        """
+        conn = self._get_connection()
+        ids = list(dict.fromkeys(symbol_ids))
+        pairs: dict[int, list[tuple[Symbol, Edge]]] = {symbol_id: [] for symbol_id in ids}
+        for i in range(0, len(ids), _MAX_IDS_PER_QUERY):
+            batch = ids[i : i + _MAX_IDS_PER_QUERY]
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                sql.format(columns=_PAIR_COLUMNS, placeholders=",".join("?" * len(batch))),
+                batch,
+            )
+            seen: set[tuple[int, int, int]] = set()
+            while rows := cursor.fetchmany(_FETCH_SIZE):
+                for row in rows:
+                    # Same (symbol, call_line) dedup as _iter_symbol_edge_pairs
+                    key = (row[group_column], row[0], row[11])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    pairs[row[group_column]].append(
+                        (Symbol.from_tuple(row[:8]), Edge.from_tuple(row[8:]))
+                    )
+        return pairs
+
+    def connection_counts(self, symbol_ids: list[int]) -> dict[int, int]:
+        """Count callers + callees for each symbol in a single aggregate query.
+
+        Counts match len(get_callees(id)) + len(get_callers(id)).
+        """
+        conn = self._get_connection()
+        counts: dict[int, int] = {}
+        for i in range(0, len(symbol_ids), _MAX_IDS_PER_QUERY):
+            batch = symbol_ids[i : i + _MAX_IDS_PER_QUERY]
+            placeholders = ",".join("?" * len(batch))
+            cursor = conn.execute(
+                f"""
+                SELECT symbol_id, COUNT(*) FROM (
+                    SELECT DISTINCT e.caller_id AS symbol_id, e.callee_id, e.call_line
+                    FROM edges e JOIN symbols s ON s.id = e.callee_id
+                    WHERE e.caller_id IN ({placeholders})
+                    UNION ALL
+                    SELECT DISTINCT e.callee_id AS symbol_id, e.caller_id, e.call_line
+                    FROM edges e JOIN symbols s ON s.id = e.caller_id
+                    WHERE e.callee_id IN ({placeholders})
+                )
+                GROUP BY symbol_id
+                """,
+                (*batch, *batch),
+            )
+            counts.update(cursor.fetchall())
+        return counts
+
+    def delete_for_file(self, file: Path) -> int:
+        """Delete all edges involving symbols in a file."""
+        conn = self._get_connection()
+        # rowcount is -1 for statements starting with WITH, so count via total_changes
+        before = conn.total_changes
+        conn.execute(_DELETE_FOR_FILE_SQL, (str(file),))
+        deleted = conn.total_changes - before
+        self._commit()
+        return deleted
 
     def clear(self) -> None:
         """Delete all edges."""
         conn = self._get_connection()
         conn.execute("DELETE FROM edges")
-        conn.commit()
+        self._commit()
 
-    def _rows_to_symbol_edge_pairs(self, rows: list[sqlite3.Row]) -> list[tuple[Symbol, Edge]]:
-        """Convert database rows to (Symbol, Edge) pairs."""
-        results = []
+
+def _iter_symbol_edge_pairs(cursor: sqlite3.Cursor) -> Iterator[tuple[Symbol, Edge]]:
+    """Convert positional _PAIR_COLUMNS rows to (Symbol, Edge) pairs.
+
+    Keeps the first edge per (symbol, call_line), so a symbol called several
+    times on one line is listed once.
+    """
+    seen: set[tuple[int, int]] = set()
+    while rows := cursor.fetchmany(_FETCH_SIZE):
         for row in rows:
-            symbol = Symbol.from_row(row)
-            edge = Edge(
-                id=row["edge_id"],
-                caller_id=row["caller_id"],
-                callee_id=row["callee_id"],
-                call_line=row["call_line"],
-                call_type=EdgeType(row["call_type"]),
-                is_conditional=bool(row["is_conditional"]),
-                condition=row["condition"],
-                is_loop=bool(row["is_loop"]),
-                is_try_block=bool(row["is_try_block"]),
-                is_except_handler=bool(row["is_except_handler"]),
-            )
-            results.append((symbol, edge))
-        return results
+            # row[0] is the other end's symbol id, row[11] the edge's call_line
+            key = (row[0], row[11])
+            if key in seen:
+                continue
+            seen.add(key)
+            yield Symbol.from_tuple(row[:8]), Edge.from_tuple(row[8:])
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import sqlite3
 from collections.abc import Callable
 from pathlib import Path
@@ -13,20 +14,38 @@ from decoder.core.models import FileRecord
 class FileStorage:
     """Storage operations for indexed files."""
 
-    def __init__(self, get_connection: Callable[[], sqlite3.Connection]) -> None:
+    def __init__(
+        self,
+        get_connection: Callable[[], sqlite3.Connection],
+        commit: Callable[[], None] | None = None,
+    ) -> None:
         self._get_connection = get_connection
+        self._commit = commit or (lambda: get_connection().commit())
 
-    def upsert(self, file: Path, content_hash: str) -> None:
-        """Insert or update a file record."""
+    def upsert(self, file: Path, content_hash: str, stat: os.stat_result | None = None) -> None:
+        """Insert or update a file record.
+
+        Pass the stat taken before hashing so a write that lands in between
+        is caught by the next needs_reindex. A record that already matches
+        is left untouched, indexed_at included.
+        """
+        if stat is None:
+            stat = file.stat()
         conn = self._get_connection()
         conn.execute(
             """
-            INSERT INTO files (path, hash, indexed_at) VALUES (?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(path) DO UPDATE SET hash = ?, indexed_at = CURRENT_TIMESTAMP
+            INSERT INTO files (path, hash, indexed_at, mtime_ns, size)
+            VALUES (?, ?, CURRENT_TIMESTAMP, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET hash = excluded.hash,
+                indexed_at = CURRENT_TIMESTAMP, mtime_ns = excluded.mtime_ns,
+                size = excluded.size
+            WHERE hash != excluded.hash
+                OR mtime_ns IS NOT excluded.mtime_ns
+                OR size IS NOT excluded.size
             """,
-            (str(file), content_hash, content_hash),
+            (str(file), content_hash, stat.st_mtime_ns, stat.st_size),
         )
-        conn.commit()
+        self._commit()
 
     def get(self, file: Path) -> FileRecord | None:
         """Get a file record, or None if not indexed."""
@@ -41,24 +60,47 @@ class FileStorage:
         """Delete a file record."""
         conn = self._get_connection()
         conn.execute("DELETE FROM files WHERE path = ?", (str(file),))
-        conn.commit()
+        self._commit()
 
     def needs_reindex(self, file: Path) -> bool:
-        """Check if a file needs to be re-indexed based on hash."""
+        """Check if a file needs to be re-indexed. See check_for_reindex."""
+        return self.check_for_reindex(file) is not None
+
+    def check_for_reindex(self, file: Path) -> tuple[os.stat_result, str] | None:
+        """Return the file's (stat, content hash) if it needs re-indexing, else None.
+
+        Unchanged mtime and size mean unchanged; otherwise fall back to the hash,
+        which is returned so the caller doesn't read the file a second time.
+        """
+        # Stat before hashing so a concurrent write is caught next run
+        stat = file.stat()
         record = self.get(file)
-        if record is None:
-            return True
-        current_hash = compute_file_hash(file)
-        return current_hash != record.hash
+        if (
+            record is not None
+            and record.mtime_ns == stat.st_mtime_ns
+            and record.size == stat.st_size
+        ):
+            return None
+        file_hash = compute_file_hash(file)
+        if record is None or file_hash != record.hash:
+            return stat, file_hash
+        # Touched but identical: remember the new stat so the next check is cheap
+        conn = self._get_connection()
+        conn.execute(
+            "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+            (stat.st_mtime_ns, stat.st_size, str(file)),
+        )
+        self._commit()
+        return None
 
     def clear(self) -> None:
         """Delete all file records."""
         conn = self._get_connection()
         conn.execute("DELETE FROM files")
-        conn.commit()
+        self._commit()
 
 
 def compute_file_hash(file: Path) -> str:
     """Compute SHA-256 hash of a file's contents."""
-    content = file.read_bytes()
-    return hashlib.sha256(content).hexdigest()
+    with file.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
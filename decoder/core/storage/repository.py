@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -41,42 +44,238 @@ CREATE TABLE IF NOT EXISTS edges (
 CREATE TABLE IF NOT EXISTS files (
     path TEXT PRIMARY KEY,
     hash TEXT NOT NULL,
-    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    mtime_ns INTEGER,
+    size INTEGER
 );
 
-CREATE INDEX IF NOT EXISTS idx_edges_caller ON edges(caller_id);
-CREATE INDEX IF NOT EXISTS idx_edges_callee ON edges(callee_id);
-CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols(file);
-CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS idx_symbols_file_line ON symbols(file, line);
 CREATE INDEX IF NOT EXISTS idx_symbols_qualified ON symbols(qualified_name);
 """
 
+# Secondary indexes that indexing never reads while it builds a fresh
+# database, so bulk_load() can drop them and build each in one pass at the end
+_BULK_LOAD_INDEXES = {
+    "idx_edges_callee_caller_line": "edges(callee_id, caller_id, call_line)",
+    "idx_symbols_name": "symbols(name)",
+}
+_CREATE_BULK_LOAD_INDEXES = "".join(
+    f"CREATE INDEX IF NOT EXISTS {name} ON {columns};\n"
+    for name, columns in _BULK_LOAD_INDEXES.items()
+)
+
+# Trigram index over symbol names so find()'s substring LIKE is answered from
+# the index instead of a full scan. Kept in sync with symbols by triggers.
+# Only created where SQLite has FTS5 with the trigram tokenizer (3.34+);
+# elsewhere find() falls back to LIKE on symbols.name.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE symbols_fts USING fts5(
+    name, content='symbols', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER symbols_fts_insert AFTER INSERT ON symbols BEGIN
+    INSERT INTO symbols_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+CREATE TRIGGER symbols_fts_delete AFTER DELETE ON symbols BEGIN
+    INSERT INTO symbols_fts(symbols_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+
+CREATE TRIGGER symbols_fts_update AFTER UPDATE OF name ON symbols BEGIN
+    INSERT INTO symbols_fts(symbols_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO symbols_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+INSERT INTO symbols_fts(symbols_fts) VALUES ('rebuild');
+"""
+
+# WAL with synchronous=NORMAL only syncs at checkpoints, not on every commit.
+# Transactions stay under sqlite3's implicit BEGIN; see SymbolRepository.transaction().
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA mmap_size=1073741824;
+PRAGMA cache_size=-262144;
+PRAGMA temp_store=MEMORY;
+"""
+
+# Columns added after the first release: (table, column, type)
+_ADDED_COLUMNS = [
+    ("files", "mtime_ns", "INTEGER"),
+    ("files", "size", "INTEGER"),
+]
+
+# Indexes superseded by composite ones
+_DROPPED_INDEXES = [
+    "idx_edges_caller",
+    "idx_edges_callee",
+    "idx_edges_caller_line",
+    "idx_symbols_file",
+]
+
+# One edge per call site; inserts of an existing edge are ignored. Created in
+# _migrate, after any duplicates left by older versions are removed.
+_UNIQUE_EDGES_INDEX = """
+CREATE UNIQUE INDEX idx_edges_unique ON edges(caller_id, callee_id, call_line, call_type)
+"""
+
+
+# Stored in PRAGMA user_version once the schema is in place, so later opens
+# skip the DDL. Bump whenever _SCHEMA, _migrate or _FTS_SCHEMA change.
+_SCHEMA_VERSION = 1
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    """Create or upgrade the schema unless user_version says it is current."""
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version == _SCHEMA_VERSION:
+        return
+    conn.executescript(_SCHEMA + _CREATE_BULK_LOAD_INDEXES)
+    _migrate(conn)
+    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Bring databases created by older versions up to the current schema."""
+    for table, column, column_type in _ADDED_COLUMNS:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    for index in _DROPPED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index}")
+    if not _schema_has(conn, "idx_edges_unique"):
+        conn.execute(
+            """
+            DELETE FROM edges WHERE id NOT IN (
+                SELECT MIN(id) FROM edges GROUP BY caller_id, callee_id, call_line, call_type
+            )
+            """
+        )
+        conn.execute(_UNIQUE_EDGES_INDEX)
+    conn.commit()
+    if not _schema_has(conn, "symbols_fts") and _supports_trigram_fts(conn):
+        # Also indexes symbols stored before the FTS table existed
+        conn.executescript(_FTS_SCHEMA)
+
+
+def _supports_trigram_fts(conn: sqlite3.Connection) -> bool:
+    """Check whether this SQLite build has FTS5 and its trigram tokenizer."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(name, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.fts_probe")
+    return True
+
+
+def _schema_has(conn: sqlite3.Connection, name: str) -> bool:
+    """Check whether a table, index or trigger exists."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row is not None
+
+
+class _ThreadState(threading.local):
+    """Per-thread connection and transaction nesting."""
+
+    conn: sqlite3.Connection | None = None
+    transaction_depth = 0
+
 
 class SymbolRepository:
-    """Facade that coordinates symbols, edges, and files storage."""
+    """Facade that coordinates symbols, edges, and files storage.
+
+    Each thread gets its own connection, so concurrent readers don't
+    serialize on one connection's mutex; with WAL they don't block the
+    writer either.
+    """
 
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
-        self._conn: sqlite3.Connection | None = None
+        self._state = _ThreadState()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._schema_ready = False
 
-        self.symbols = SymbolStorage(self._get_connection)
-        self.edges = EdgeStorage(self._get_connection)
-        self.files = FileStorage(self._get_connection)
+        self.symbols = SymbolStorage(self._get_connection, self._commit)
+        self.edges = EdgeStorage(self._get_connection, self._commit)
+        self.files = FileStorage(self._get_connection, self._commit)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get or create a database connection."""
-        if self._conn is None:
+        """Get or create this thread's database connection."""
+        conn = self._state.conn
+        if conn is None:
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
-            self._conn = sqlite3.connect(self._db_path)
-            self._conn.row_factory = sqlite3.Row
-            self._conn.executescript(_SCHEMA)
-        return self._conn
+            # Only ever used from this thread; close() may run on another one
+            conn = sqlite3.connect(self._db_path, cached_statements=512, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_PRAGMAS)
+            with self._lock:
+                if not self._schema_ready:
+                    _ensure_schema(conn)
+                    self._schema_ready = True
+                self._connections.append(conn)
+            self._state.conn = conn
+        return conn
+
+    def _commit(self) -> None:
+        """Commit, unless inside transaction(), which commits once on exit."""
+        if self._state.transaction_depth == 0:
+            self._get_connection().commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group storage writes into a single commit, rolling back on error.
+
+        Nested uses join the outermost transaction.
+        """
+        conn = self._get_connection()
+        state = self._state
+        state.transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            state.transaction_depth -= 1
+            if state.transaction_depth == 0:
+                conn.rollback()
+                self.symbols.clear_cache()
+            raise
+        state.transaction_depth -= 1
+        if state.transaction_depth == 0:
+            conn.commit()
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Drop write-only secondary indexes for the duration, then rebuild them.
+
+        Only pays off when nearly every row is new, e.g. indexing into an
+        empty database. Must not be entered inside transaction(): rebuilding
+        the indexes commits.
+        """
+        conn = self._get_connection()
+        for name in _BULK_LOAD_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        # If the process dies before the rebuild, the next open recreates them
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.executescript(_CREATE_BULK_LOAD_INDEXES)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def is_empty(self) -> bool:
+        """Check whether no symbols have been stored yet."""
+        conn = self._get_connection()
+        return conn.execute("SELECT 1 FROM symbols LIMIT 1").fetchone() is None
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        """Close every thread's database connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            # Fresh state so no thread keeps a closed connection
+            self._state = _ThreadState()
+        for conn in connections:
+            conn.close()
 
     def __enter__(self) -> SymbolRepository:
         return self
@@ -86,19 +285,23 @@ class SymbolRepository:
 
     def delete_file(self, file: Path) -> None:
         """Delete a file and all its symbols/edges."""
-        self.edges.delete_for_file(file)
-        self.symbols.delete_in_file(file)
-        self.files.delete(file)
+        with self.transaction():
+            self.edges.delete_for_file(file)
+            self.symbols.delete_in_file(file)
+            self.files.delete(file)
 
     def get_stats(self) -> dict[str, int | datetime | None]:
         """Get index statistics."""
         conn = self._get_connection()
 
-        file_count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
-        symbol_count = conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
-        edge_count = conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
-
-        last_indexed_row = conn.execute("SELECT MAX(indexed_at) FROM files").fetchone()[0]
+        file_count, symbol_count, edge_count, last_indexed_row = conn.execute(
+            """
+            SELECT (SELECT COUNT(*) FROM files),
+                   (SELECT COUNT(*) FROM symbols),
+                   (SELECT COUNT(*) FROM edges),
+                   (SELECT MAX(indexed_at) FROM files)
+            """
+        ).fetchone()
         last_indexed = datetime.fromisoformat(last_indexed_row) if last_indexed_row else None
 
         return {
@@ -110,9 +313,10 @@ class SymbolRepository:
 
     def clear(self) -> None:
         """Clear all data from the database."""
-        self.edges.clear()
-        self.symbols.clear()
-        self.files.clear()
+        with self.transaction():
+            self.edges.clear()
+            self.symbols.clear()
+            self.files.clear()
 
 
 def get_default_db_path(project_root: Path) -> Path:
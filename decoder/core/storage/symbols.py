@@ -3,18 +3,41 @@
 from __future__ import annotations
 
 import sqlite3
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import Final
 
 from decoder.core.exceptions import SymbolNotFoundError
 from decoder.core.models import Symbol, SymbolType
 
+# Column order expected by Symbol.from_tuple
+SYMBOL_COLUMNS: Final = "id, name, qualified_name, file, line, end_line, type, parent_id"
+
+# Batch insert with caller-assigned IDs; one constant string so sqlite3 reuses
+# the compiled statement from its cache
+_INSERT_SYMBOL_SQL: Final = (
+    "INSERT INTO symbols (id, name, qualified_name, file, line, end_line, type, parent_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+SymbolRow = tuple[int, str, str, str, int, int | None, str, int | None]
+
 
 class SymbolStorage:
     """Storage operations for symbols."""
 
-    def __init__(self, get_connection: Callable[[], sqlite3.Connection]) -> None:
+    def __init__(
+        self,
+        get_connection: Callable[[], sqlite3.Connection],
+        commit: Callable[[], None] | None = None,
+    ) -> None:
         self._get_connection = get_connection
+        self._commit = commit or (lambda: get_connection().commit())
+        # qualified_name -> lowest id, for names known to exist. Inserts never
+        # change the lowest id, so only deletes (and rollbacks) invalidate it.
+        self._qname_cache: dict[str, int] = {}
+        # Whether the trigram table exists; not every SQLite build can create it
+        self._has_fts: bool | None = None
 
     def insert(
         self,
@@ -35,57 +58,117 @@ class SymbolStorage:
             """,
             (name, qualified_name, str(file), line, end_line, symbol_type.value, parent_id),
         )
-        conn.commit()
+        self._commit()
         return cursor.lastrowid  # type: ignore[return-value]
 
+    def insert_many(self, rows: Iterable[SymbolRow]) -> None:
+        """Insert symbols with caller-assigned IDs in one transaction.
+
+        Rows are (id, name, qualified_name, file, line, end_line, type, parent_id);
+        use next_id() to pick IDs so parent_id can reference rows in the same batch.
+        """
+        conn = self._get_connection()
+        conn.executemany(_INSERT_SYMBOL_SQL, rows)
+        self._commit()
+
+    def next_id(self) -> int:
+        """Get the smallest ID above every stored symbol."""
+        conn = self._get_connection()
+        return conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM symbols").fetchone()[0]  # type: ignore[no-any-return]
+
     def get_by_id(self, symbol_id: int) -> Symbol:
         """Get a symbol by its ID."""
-        conn = self._get_connection()
-        cursor = conn.execute("SELECT * FROM symbols WHERE id = ?", (symbol_id,))
-        row = cursor.fetchone()
+        row = self._select("WHERE id = ?", (symbol_id,)).fetchone()
         if row is None:
             raise SymbolNotFoundError(f"Symbol with id {symbol_id} not found")
-        return Symbol.from_row(row)
+        return Symbol.from_tuple(row)
 
     def get_by_qualified_name(self, qualified_name: str) -> Symbol:
         """Get a symbol by its qualified name."""
-        conn = self._get_connection()
-        cursor = conn.execute("SELECT * FROM symbols WHERE qualified_name = ?", (qualified_name,))
-        row = cursor.fetchone()
+        row = self._select("WHERE qualified_name = ?", (qualified_name,)).fetchone()
         if row is None:
             raise SymbolNotFoundError(f"Symbol '{qualified_name}' not found")
-        return Symbol.from_row(row)
+        return Symbol.from_tuple(row)
+
+    def id_by_qualified_name(self, qualified_name: str) -> int | None:
+        """Get the ID of a symbol by qualified name, or None if there is none."""
+        symbol_id = self._qname_cache.get(qualified_name)
+        if symbol_id is None:
+            conn = self._get_connection()
+            (symbol_id,) = conn.execute(
+                "SELECT MIN(id) FROM symbols WHERE qualified_name = ?", (qualified_name,)
+            ).fetchone()
+            if symbol_id is not None:
+                self._qname_cache[qualified_name] = symbol_id
+        return symbol_id
+
+    def clear_cache(self) -> None:
+        """Forget cached qualified-name lookups."""
+        self._qname_cache.clear()
 
     def find(self, query: str, symbol_type: SymbolType | None = None) -> list[Symbol]:
         """Search for symbols by name (fuzzy match)."""
-        conn = self._get_connection()
+        # LIKE on the trigram table uses its index (for patterns of 3+ chars)
+        # and matches exactly what name LIKE would on symbols.
+        if self._has_fts is None:
+            conn = self._get_connection()
+            row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'symbols_fts'").fetchone()
+            self._has_fts = row is not None
+        if self._has_fts:
+            match = "WHERE id IN (SELECT rowid FROM symbols_fts WHERE name LIKE ?)"
+        else:
+            match = "WHERE name LIKE ?"
         if symbol_type is not None:
-            cursor = conn.execute(
-                "SELECT * FROM symbols WHERE name LIKE ? AND type = ? ORDER BY name",
+            cursor = self._select(
+                f"{match} AND type = ? ORDER BY name, id",
                 (f"%{query}%", symbol_type.value),
             )
         else:
-            cursor = conn.execute(
-                "SELECT * FROM symbols WHERE name LIKE ? ORDER BY name",
-                (f"%{query}%",),
-            )
-        return [Symbol.from_row(row) for row in cursor.fetchall()]
+            cursor = self._select(f"{match} ORDER BY name, id", (f"%{query}%",))
+        return [Symbol.from_tuple(row) for row in cursor.fetchall()]
 
-    def get_in_file(self, file: Path) -> list[Symbol]:
-        """Get all symbols in a file."""
+    def ids_by_qualified_name(self, qualified_names: Iterable[str]) -> dict[str, int]:
+        """Map each stored qualified name in the input to its lowest symbol ID.
+
+        Names are staged in a temp table and resolved with a single join.
+        """
         conn = self._get_connection()
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS name_lookup (qualified_name TEXT PRIMARY KEY)"
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO name_lookup VALUES (?)", ((name,) for name in qualified_names)
+        )
         cursor = conn.execute(
-            "SELECT * FROM symbols WHERE file = ? ORDER BY line",
-            (str(file),),
+            """
+            SELECT s.qualified_name, MIN(s.id)
+            FROM name_lookup n JOIN symbols s ON s.qualified_name = n.qualified_name
+            GROUP BY s.qualified_name
+            """
         )
-        return [Symbol.from_row(row) for row in cursor.fetchall()]
+        cursor.row_factory = None
+        ids = dict(cursor.fetchall())
+        conn.execute("DELETE FROM name_lookup")
+        self._commit()
+        return ids
+
+    def iter_qualified_names(self) -> Iterator[tuple[int, str]]:
+        """Yield (id, qualified_name) for every symbol, in ID order."""
+        conn = self._get_connection()
+        cursor = conn.execute("SELECT id, qualified_name FROM symbols ORDER BY id")
+        cursor.row_factory = None
+        yield from cursor
+
+    def get_in_file(self, file: Path) -> list[Symbol]:
+        """Get all symbols in a file."""
+        cursor = self._select("WHERE file = ? ORDER BY line", (str(file),))
+        return [Symbol.from_tuple(row) for row in cursor.fetchall()]
 
     def get_at_line(self, file: Path, line: int) -> Symbol:
         """Get the symbol at a specific line (or the nearest enclosing one)."""
-        conn = self._get_connection()
-        cursor = conn.execute(
+        # Walks idx_symbols_file_line backwards from the line; no sort needed
+        cursor = self._select(
             """
-            SELECT * FROM symbols
             WHERE file = ? AND line <= ? AND (end_line IS NULL OR end_line >= ?)
             ORDER BY line DESC
             LIMIT 1
@@ -95,17 +178,28 @@ class SymbolStorage:
         row = cursor.fetchone()
         if row is None:
             raise SymbolNotFoundError(f"No symbol at {file}:{line}")
-        return Symbol.from_row(row)
+        return Symbol.from_tuple(row)
 
     def delete_in_file(self, file: Path) -> int:
         """Delete all symbols in a file. Returns count deleted."""
         conn = self._get_connection()
         cursor = conn.execute("DELETE FROM symbols WHERE file = ?", (str(file),))
-        conn.commit()
+        self._qname_cache.clear()
+        self._commit()
         return cursor.rowcount
 
     def clear(self) -> None:
         """Delete all symbols."""
         conn = self._get_connection()
         conn.execute("DELETE FROM symbols")
-        conn.commit()
+        self._qname_cache.clear()
+        self._commit()
+
+    def _select(self, clause: str, params: tuple[object, ...]) -> sqlite3.Cursor:
+        """Run SELECT <symbol columns> FROM symbols <clause> on a plain-tuple cursor.
+
+        Rows come back in Symbol.from_tuple order.
+        """
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
+        return cursor.execute(f"SELECT {SYMBOL_COLUMNS} FROM symbols {clause}", params)
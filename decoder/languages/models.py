@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 
 from decoder.core.models import EdgeType, SymbolType
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSymbol:
     """A symbol extracted from source code (before storage)."""
 
@@ -21,7 +22,7 @@ class ParsedSymbol:
     parent_qualified_name: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CallContext:
     """Context about where a call occurs (conditional, loop, etc.)."""
 
@@ -34,7 +35,7 @@ class CallContext:
     except_type: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedEdge:
     """A relationship extracted from source code (before storage)."""
 
@@ -48,7 +49,7 @@ class ParsedEdge:
     context: CallContext | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TypedVar:
     """A variable with a known type annotation."""
 
@@ -67,3 +68,11 @@ class ParseResult:
     imports: dict[str, str]
     star_imports: list[str]
     typed_vars: list[TypedVar] | None = None
+
+    @cached_property
+    def typed_vars_index(self) -> dict[tuple[str, str], str]:
+        """Map (scope_qualified_name, name) to type_name, first declaration winning."""
+        index: dict[tuple[str, str], str] = {}
+        for tv in self.typed_vars or ():
+            index.setdefault((tv.scope_qualified_name, tv.name), tv.type_name)
+        return index
@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 import ast
-from dataclasses import dataclass
+import io
+import sys
+import tokenize
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Any, ClassVar, Final
 
 from decoder.core.exceptions import ParseError
 from decoder.core.models import EdgeType, SymbolType
@@ -16,6 +22,47 @@ from decoder.languages.models import (
     TypedVar,
 )
 
+# Below this many files, starting worker processes costs more than it saves
+_PARALLEL_PARSE_THRESHOLD = 32
+_PARSE_CHUNKSIZE: Final = 16
+
+# Decorators not recorded as call edges; @property is tracked separately
+_SKIP_DECORATORS: Final = frozenset({"property"})
+# Parameters bound implicitly, whose annotations say nothing about callers
+_IMPLICIT_PARAMS: Final = frozenset({"self", "cls"})
+
+_worker_parser: PythonParser | None = None
+
+
+def _decodes(source: bytes) -> bool:
+    """Check that source decodes under its declared (PEP 263) encoding."""
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+        source.decode(encoding)
+    except (SyntaxError, UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+def _init_worker() -> PythonParser:
+    """Build the worker's parser once, when the process starts."""
+    global _worker_parser
+    _worker_parser = PythonParser()
+    return _worker_parser
+
+
+def _parse_one(file: Path) -> ParseResult | ParseError:
+    """Parse one file, returning rather than raising ParseError.
+
+    Top-level so worker processes can unpickle it. Uses the worker's parser
+    set up by _init_worker, or builds one when called in-process.
+    """
+    parser = _worker_parser or _init_worker()
+    try:
+        return parser.parse(file)
+    except ParseError as e:
+        return e
+
 
 class PythonParser:
     """Parser for Python source files using the ast module."""
@@ -26,14 +73,17 @@ class PythonParser:
 
     def parse(self, file: Path) -> ParseResult:
         """Parse a Python file and extract symbols and edges."""
-        try:
-            source = file.read_text(encoding="utf-8")
-        except UnicodeDecodeError as e:
-            raise ParseError(f"Cannot read {file}: {e}") from e
+        # Bytes, so ast.parse decodes the source itself (honouring any coding
+        # declaration) instead of us decoding it only for it to be re-encoded
+        return self.parse_source(file.read_bytes(), file)
 
+    def parse_source(self, source: bytes, file: Path) -> ParseResult:
+        """Parse Python source already in memory, as if read from file."""
         try:
             tree = ast.parse(source, filename=str(file))
         except SyntaxError as e:
+            if not _decodes(source):
+                raise ParseError(f"Cannot read {file}: {e}") from e
             raise ParseError(f"Syntax error in {file}: {e}") from e
 
         visitor = _PythonVisitor(file)
@@ -48,8 +98,20 @@ class PythonParser:
             typed_vars=visitor.typed_vars,
         )
 
+    def parse_many(self, files: Sequence[Path]) -> Generator[ParseResult | ParseError, None, None]:
+        """Parse files across CPU cores, yielding results in input order.
+
+        A file that fails to parse yields its ParseError instead of raising,
+        so one bad file doesn't abort the batch.
+        """
+        if len(files) < _PARALLEL_PARSE_THRESHOLD:
+            yield from map(_parse_one, files)
+            return
+        with ProcessPoolExecutor(initializer=_init_worker) as executor:
+            yield from executor.map(_parse_one, files, chunksize=_PARSE_CHUNKSIZE)
+
 
-@dataclass
+@dataclass(slots=True)
 class _Scope:
     """Tracks the current scope during AST traversal."""
 
@@ -62,6 +124,10 @@ class _Scope:
 class _PythonVisitor(ast.NodeVisitor):
     """AST visitor that extracts symbols and edges from Python code."""
 
+    # Node type -> visit_* method, filled in below the class. Replaces
+    # NodeVisitor's per-node "visit_" + class name string build and getattr.
+    _DISPATCH: ClassVar[dict[type[ast.AST], Callable[[_PythonVisitor, Any], None]]] = {}
+
     def __init__(self, file: Path) -> None:
         self.file = file
         self.symbols: list[ParsedSymbol] = []
@@ -70,7 +136,7 @@ class _PythonVisitor(ast.NodeVisitor):
         self.star_imports: list[str] = []
         self.typed_vars: list[TypedVar] = []
 
-        self._module_name = self._path_to_module(file)
+        self._module_name = sys.intern(self._path_to_module(file))
 
         self._scope_stack: list[_Scope] = []
 
@@ -80,7 +146,15 @@ class _PythonVisitor(ast.NodeVisitor):
 
         self._current_func_params: dict[str, str] = {}
 
-        self._context_stack: list[CallContext] = []
+        # One entry per enclosing if/loop/try/with block, each already merged
+        # with the blocks around it; edges share the top entry
+        self._merged_stack: list[CallContext] = []
+        # If test whose text becomes the condition of _merged_stack[index:],
+        # unparsed only once an edge captures that context:
+        # (index, test, is_else_branch)
+        self._pending_condition: tuple[int, ast.expr, bool] | None = None
+        # Last unparsed test, so an else branch reuses its if branch's text
+        self._unparsed: tuple[ast.expr | None, str] = (None, "")
 
     def _path_to_module(self, path: Path) -> str:
         """Convert a file path to a module name."""
@@ -103,34 +177,59 @@ class _PythonVisitor(ast.NodeVisitor):
         """Create a fully qualified name for a symbol."""
         return f"{self._current_qualified_name()}.{name}"
 
+    def _push_context(
+        self, ctx: CallContext, test: ast.expr | None = None, is_else: bool = False
+    ) -> None:
+        """Enter a conditional/loop/try context, merging it with the enclosing ones.
+
+        For a conditional context, ``test`` may be given in place of ``condition``
+        to defer unparsing it until an edge needs it.
+        """
+        merged = replace(self._merged_stack[-1]) if self._merged_stack else CallContext()
+        if ctx.is_conditional:
+            merged.is_conditional = True
+            # The outermost condition describes the branch best
+            if not merged.condition and self._pending_condition is None:
+                if ctx.condition:
+                    merged.condition = ctx.condition
+                elif test is not None:
+                    self._pending_condition = (len(self._merged_stack), test, is_else)
+        if ctx.is_loop:
+            merged.is_loop = True
+            merged.loop_type = ctx.loop_type
+        if ctx.is_try_block:
+            merged.is_try_block = True
+        if ctx.is_except_handler:
+            merged.is_except_handler = True
+            merged.except_type = ctx.except_type
+        self._merged_stack.append(merged)
+
+    def _pop_context(self) -> None:
+        """Leave the innermost context."""
+        self._merged_stack.pop()
+        pending = self._pending_condition
+        if pending is not None and pending[0] == len(self._merged_stack):
+            self._pending_condition = None
+
     def _get_current_context(self) -> CallContext | None:
-        """Get the merged context from the context stack."""
-        if not self._context_stack:
+        """Get the merged context of the enclosing blocks, or None outside any."""
+        if not self._merged_stack:
             return None
-
-        merged = CallContext()
-        for ctx in self._context_stack:
-            if ctx.is_conditional:
-                merged.is_conditional = True
-                if ctx.condition and not merged.condition:
-                    merged.condition = ctx.condition
-            if ctx.is_loop:
-                merged.is_loop = True
-                merged.loop_type = ctx.loop_type
-            if ctx.is_try_block:
-                merged.is_try_block = True
-            if ctx.is_except_handler:
-                merged.is_except_handler = True
-                merged.except_type = ctx.except_type
-
-        if (
-            merged.is_conditional
-            or merged.is_loop
-            or merged.is_try_block
-            or merged.is_except_handler
-        ):
-            return merged
-        return None
+        if self._pending_condition is not None:
+            self._resolve_condition()
+        return self._merged_stack[-1]
+
+    def _resolve_condition(self) -> None:
+        """Unparse the pending if test into the contexts it applies to."""
+        assert self._pending_condition is not None
+        index, test, is_else = self._pending_condition
+        self._pending_condition = None
+        condition = self._unparse_condition(test)
+        if is_else:
+            condition = f"not ({condition})" if len(condition) < 30 else "else"
+        # Contexts pushed above the owner copied its unset condition
+        for ctx in self._merged_stack[index:]:
+            ctx.condition = condition
 
     def _add_symbol(
         self,
@@ -143,15 +242,17 @@ class _PythonVisitor(ast.NodeVisitor):
         qualified_name = self._make_qualified_name(name)
         parent_scope = self._current_scope()
 
+        # Positional: keyword arguments make the dataclass __init__ noticeably
+        # slower, and this runs for every definition
         self.symbols.append(
             ParsedSymbol(
-                name=name,
-                qualified_name=qualified_name,
-                file=self.file,
-                line=node.lineno,
-                end_line=end_line or getattr(node, "end_lineno", None),
-                type=symbol_type,
-                parent_qualified_name=parent_scope.qualified_name if parent_scope else None,
+                name,
+                qualified_name,
+                self.file,
+                node.lineno,
+                end_line or getattr(node, "end_lineno", None),
+                symbol_type,
+                parent_scope.qualified_name if parent_scope else None,
             )
         )
         return qualified_name
@@ -172,19 +273,41 @@ class _PythonVisitor(ast.NodeVisitor):
         else:
             caller = scope.qualified_name
 
+        # Positional for the same reason as in _add_symbol, on every call site
         self.edges.append(
             ParsedEdge(
-                caller_qualified_name=caller,
-                callee_name=callee_name,
-                call_line=line,
-                call_type=edge_type,
-                is_self_call=is_self_call,
-                is_attribute=is_attribute,
-                import_source=import_source,
-                context=self._get_current_context(),
+                caller,
+                # The same callees ("print", "self.save") recur throughout a file
+                sys.intern(callee_name),
+                line,
+                edge_type,
+                is_self_call,
+                is_attribute,
+                import_source,
+                self._get_current_context(),
             )
         )
 
+    def visit(self, node: ast.AST) -> None:
+        """Visit a node through the dispatch table."""
+        self._DISPATCH.get(type(node), _PythonVisitor.generic_visit)(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Visit all child nodes.
+
+        Same order as ast.iter_child_nodes, without its two generator layers.
+        """
+        dispatch = self._DISPATCH
+        generic = _PythonVisitor.generic_visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        dispatch.get(type(item), generic)(self, item)
+            elif isinstance(value, ast.AST):
+                dispatch.get(type(value), generic)(self, value)
+
     def visit_Import(self, node: ast.Import) -> None:
         """Handle: import foo, import foo.bar, import foo as f"""
         for alias in node.names:
@@ -198,7 +321,6 @@ class _PythonVisitor(ast.NodeVisitor):
                 edge_type=EdgeType.IMPORT,
                 import_source=module_name,
             )
-        self.generic_visit(node)
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Handle: from foo import bar, from foo import bar as b, from foo import *"""
@@ -227,7 +349,6 @@ class _PythonVisitor(ast.NodeVisitor):
                     edge_type=EdgeType.IMPORT,
                     import_source=module,
                 )
-        self.generic_visit(node)
 
     def _resolve_relative_import(self, level: int, module: str) -> str:
         """Resolve a relative import to an absolute module path."""
@@ -298,8 +419,8 @@ class _PythonVisitor(ast.NodeVisitor):
 
         symbol_type = SymbolType.METHOD if is_method else SymbolType.FUNCTION
 
-        is_property = any(self._get_name_from_node(d) == "property" for d in node.decorator_list)
-        if is_property:
+        decorator_names = [self._get_name_from_node(d) for d in node.decorator_list]
+        if "property" in decorator_names:
             self._property_methods.add(self._make_qualified_name(node.name))
 
         qualified_name = self._add_symbol(
@@ -311,9 +432,8 @@ class _PythonVisitor(ast.NodeVisitor):
 
         self._extract_parameter_types(node, qualified_name)
 
-        for decorator in node.decorator_list:
-            dec_name = self._get_name_from_node(decorator)
-            if dec_name and dec_name != "property":  # Skip @property itself
+        for decorator, dec_name in zip(node.decorator_list, decorator_names, strict=True):
+            if dec_name and dec_name not in _SKIP_DECORATORS:
                 self._add_edge(
                     callee_name=dec_name,
                     line=decorator.lineno,
@@ -324,7 +444,7 @@ class _PythonVisitor(ast.NodeVisitor):
         self._current_func_params = {}
         if is_method and node.name == "__init__":
             for arg in node.args.args:
-                if arg.annotation and arg.arg not in ("self", "cls"):
+                if arg.annotation and arg.arg not in _IMPLICIT_PARAMS:
                     type_name = self._extract_type_from_annotation(arg.annotation)
                     if type_name:
                         self._current_func_params[arg.arg] = type_name
@@ -350,7 +470,7 @@ class _PythonVisitor(ast.NodeVisitor):
         for arg in node.args.args:
             if arg.annotation:
                 type_name = self._extract_type_from_annotation(arg.annotation)
-                if type_name and arg.arg not in ("self", "cls"):
+                if type_name and arg.arg not in _IMPLICIT_PARAMS:
                     self.typed_vars.append(
                         TypedVar(
                             name=arg.arg,
@@ -400,22 +520,25 @@ class _PythonVisitor(ast.NodeVisitor):
 
         if scope is None or scope.type == SymbolType.CLASS:
             for target in node.targets:
-                if isinstance(target, ast.Name):
+                if type(target) is ast.Name:
                     self._add_symbol(
                         name=target.id,
                         node=node,
                         symbol_type=SymbolType.VARIABLE,
                     )
-                elif isinstance(target, ast.Tuple):
+                elif type(target) is ast.Tuple:
                     for elt in target.elts:
-                        if isinstance(elt, ast.Name):
+                        if type(elt) is ast.Name:
                             self._add_symbol(
                                 name=elt.id,
                                 node=node,
                                 symbol_type=SymbolType.VARIABLE,
                             )
 
-        self.generic_visit(node)
+        # Children in field order, as generic_visit would, so edge order is kept
+        for target in node.targets:
+            self.visit(target)
+        self.visit(node.value)
 
     def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
         """Handle annotated assignments (e.g., x: int = 5)."""
@@ -427,7 +550,10 @@ class _PythonVisitor(ast.NodeVisitor):
                     node=node,
                     symbol_type=SymbolType.VARIABLE,
                 )
-        self.generic_visit(node)
+        self.visit(node.target)
+        self.visit(node.annotation)
+        if node.value is not None:
+            self.visit(node.value)
 
     def visit_Call(self, node: ast.Call) -> None:
         """Handle function and method calls."""
@@ -440,69 +566,63 @@ class _PythonVisitor(ast.NodeVisitor):
                 edge_type=EdgeType.CALL,
                 is_self_call=is_self_call,
             )
-        self.generic_visit(node)
+        # Field order (func, args, keywords); a keyword's only child is its value
+        visit = self.visit
+        visit(node.func)
+        for arg in node.args:
+            visit(arg)
+        for keyword in node.keywords:
+            visit(keyword.value)
 
     def visit_Attribute(self, node: ast.Attribute) -> None:
         """Handle attribute access (but not calls - those are handled by visit_Call)."""
-        if not isinstance(node.ctx, ast.Load):
-            self.generic_visit(node)
-            return
-
-        # Skip - visit_Call handles function/method calls
-        # We only want pure attribute access like obj.attr (not obj.method())
-        # This is tracked via _pending_calls set
-        self.generic_visit(node)
+        # Nothing is recorded for the access itself; only the object expression
+        # can contain calls (ctx is a leaf)
+        self.visit(node.value)
 
     def _unparse_condition(self, node: ast.expr) -> str:
         """Convert an AST condition back to a readable string."""
+        if self._unparsed[0] is node:
+            return self._unparsed[1]
         try:
-            return ast.unparse(node)
+            text = ast.unparse(node)
         except Exception:
-            return "<condition>"
+            text = "<condition>"
+        self._unparsed = (node, text)
+        return text
 
     def visit_If(self, node: ast.If) -> None:
         """Track calls inside if/else blocks as conditional."""
-        condition_str = self._unparse_condition(node.test)
-
         self.visit(node.test)
 
-        self._context_stack.append(
-            CallContext(
-                is_conditional=True,
-                condition=condition_str,
-            )
-        )
+        # The condition text is only unparsed if a call inside needs it
+        self._push_context(CallContext(is_conditional=True), test=node.test)
         for stmt in node.body:
             self.visit(stmt)
-        self._context_stack.pop()
+        self._pop_context()
 
         if node.orelse:
-            self._context_stack.append(
-                CallContext(
-                    is_conditional=True,
-                    condition=f"not ({condition_str})" if len(condition_str) < 30 else "else",
-                )
-            )
+            self._push_context(CallContext(is_conditional=True), test=node.test, is_else=True)
             for stmt in node.orelse:
                 self.visit(stmt)
-            self._context_stack.pop()
+            self._pop_context()
 
     def visit_For(self, node: ast.For) -> None:
         """Track calls inside for loops."""
-        self._context_stack.append(
+        self._push_context(
             CallContext(
                 is_loop=True,
                 loop_type="for",
             )
         )
         self.generic_visit(node)
-        self._context_stack.pop()
+        self._pop_context()
 
     def visit_While(self, node: ast.While) -> None:
         """Track calls inside while loops."""
         self.visit(node.test)
 
-        self._context_stack.append(
+        self._push_context(
             CallContext(
                 is_loop=True,
                 loop_type="while",
@@ -510,7 +630,7 @@ class _PythonVisitor(ast.NodeVisitor):
         )
         for stmt in node.body:
             self.visit(stmt)
-        self._context_stack.pop()
+        self._pop_context()
 
         if node.orelse:
             for stmt in node.orelse:
@@ -518,16 +638,16 @@ class _PythonVisitor(ast.NodeVisitor):
 
     def visit_Try(self, node: ast.Try) -> None:
         """Track calls inside try/except blocks."""
-        self._context_stack.append(CallContext(is_try_block=True))
+        self._push_context(CallContext(is_try_block=True))
         for stmt in node.body:
             self.visit(stmt)
-        self._context_stack.pop()
+        self._pop_context()
 
         for handler in node.handlers:
             except_type = None
             if handler.type:
                 except_type = self._get_name_from_node(handler.type)
-            self._context_stack.append(
+            self._push_context(
                 CallContext(
                     is_except_handler=True,
                     except_type=except_type,
@@ -535,7 +655,7 @@ class _PythonVisitor(ast.NodeVisitor):
             )
             for stmt in handler.body:
                 self.visit(stmt)
-            self._context_stack.pop()
+            self._pop_context()
 
         if node.orelse:
             for stmt in node.orelse:
@@ -547,24 +667,52 @@ class _PythonVisitor(ast.NodeVisitor):
 
     def visit_With(self, node: ast.With) -> None:
         """Track calls inside with blocks (context managers)."""
-        self._context_stack.append(CallContext(is_try_block=True))
+        self._push_context(CallContext(is_try_block=True))
         self.generic_visit(node)
-        self._context_stack.pop()
+        self._pop_context()
 
     def _get_name_from_node(self, node: ast.AST | None) -> str | None:
-        """Extract a name string from various AST node types."""
-        if node is None:
-            return None
+        """Extract a name string from various AST node types.
+
+        Walks Attribute/Call/Subscript chains down to a Name, e.g. a.b().c -> "a.b.c".
+        If the chain ends in anything else, the attributes collected so far are used.
+        """
+        parts: list[str] = []
+        while True:
+            if type(node) is ast.Attribute:
+                parts.append(node.attr)
+                node = node.value
+            elif type(node) is ast.Name:
+                parts.append(node.id)
+                break
+            elif type(node) is ast.Call:
+                node = node.func
+            elif type(node) is ast.Subscript:
+                node = node.value
+            elif parts:
+                break
+            else:
+                return None
+        parts.reverse()
+        return ".".join(parts)
+
+
+def _skip(visitor: _PythonVisitor, node: ast.AST) -> None:
+    """Dispatch target for nodes that cannot contain anything we record."""
+
+
+# Leaves: contexts and operators (no fields), plus names and constants
+_LEAF_TYPES = [
+    cls
+    for cls in vars(ast).values()
+    if isinstance(cls, type) and issubclass(cls, ast.AST) and cls._fields == ()
+] + [ast.Name, ast.Constant]
 
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            value_name = self._get_name_from_node(node.value)
-            if value_name:
-                return f"{value_name}.{node.attr}"
-            return node.attr
-        elif isinstance(node, ast.Call):
-            return self._get_name_from_node(node.func)
-        elif isinstance(node, ast.Subscript):
-            return self._get_name_from_node(node.value)
-        return None
+_PythonVisitor._DISPATCH = {
+    **dict.fromkeys(_LEAF_TYPES, _skip),
+    **{
+        getattr(ast, name.removeprefix("visit_")): method
+        for name, method in vars(_PythonVisitor).items()
+        if name.startswith("visit_")
+    },
+}
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -10,21 +11,85 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
-from decoder.core.graph import load_from_repository
+from decoder.core.graph import CallGraph, load_from_repository
 from decoder.core.graph.traversal import get_callee_tree, get_caller_tree
+from decoder.core.models import SYMBOL_TYPE_BY_VALUE
 from decoder.core.storage import SymbolRepository, get_default_db_path
 
 server = Server("decoder")
 
+# Built once rather than per json.dumps call. Results are trees of fresh
+# dicts and lists, so the circular-reference check is wasted work.
+_JSON_ENCODER = json.JSONEncoder(indent=2, check_circular=False, ensure_ascii=False)
+
+# Open repositories by index path, with the (st_dev, st_ino) of the file
+_repo_cache: dict[Path, tuple[tuple[int, int], SymbolRepository]] = {}
+
+# Full call graphs of recently traced indexes, least recently used first
+_GRAPH_CACHE_SIZE = 4
+_graph_cache: OrderedDict[tuple[Any, ...], CallGraph] = OrderedDict()
+
 
 def _get_repo() -> SymbolRepository:
-    """Get repository for current directory."""
+    """Get repository for current directory.
+
+    The repository, and with it the connection and its statement cache, stays
+    open across tool calls. It is reopened if the database file is replaced,
+    e.g. by deleting the index and indexing again.
+    """
     db_path = get_default_db_path(Path.cwd())
-    if not db_path.exists():
+    cached = _repo_cache.get(db_path)
+    try:
+        stat = db_path.stat()
+    except FileNotFoundError:
+        if cached is not None:
+            cached[1].close()
+            del _repo_cache[db_path]
         raise FileNotFoundError(
             f"No decoder index found. Run 'decoder index .' first.\nExpected: {db_path}"
-        )
-    return SymbolRepository(db_path)
+        ) from None
+
+    identity = (stat.st_dev, stat.st_ino)
+    if cached is not None:
+        if cached[0] == identity:
+            return cached[1]
+        cached[1].close()
+    repo = SymbolRepository(db_path)
+    _repo_cache[db_path] = (identity, repo)
+    return repo
+
+
+def _graph_cache_key(db_path: Path) -> tuple[Any, ...]:
+    """Key that changes whenever the index is written.
+
+    Commits land in the WAL file until a checkpoint copies them into the
+    database, so the stats of both files are part of the key. An empty WAL
+    is left out: every connection recreates it, including our own reads.
+    """
+    key: list[Any] = [db_path]
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            key.append(None)
+            continue
+        key.append((stat.st_mtime_ns, stat.st_size) if stat.st_size else None)
+    return tuple(key)
+
+
+def _load_graph(repo: SymbolRepository) -> CallGraph:
+    """Load the full call graph, reusing it until the index changes."""
+    key = _graph_cache_key(get_default_db_path(Path.cwd()))
+    graph = _graph_cache.get(key)
+    if graph is not None:
+        _graph_cache.move_to_end(key)
+        return graph
+
+    graph = load_from_repository(repo)
+    _graph_cache[key] = graph
+    if len(_graph_cache) > _GRAPH_CACHE_SIZE:
+        _graph_cache.popitem(last=False)
+    return graph
 
 
 def _symbol_to_dict(symbol: Any) -> dict[str, Any]:
@@ -39,115 +104,147 @@ def _symbol_to_dict(symbol: Any) -> dict[str, Any]:
     }
 
 
-def _tree_to_dict(node: Any, depth: int = 0) -> dict[str, Any]:
-    """Convert a TreeNode to a JSON-serializable dict."""
+def _call_site_to_dict(symbol: Any, edge: Any) -> dict[str, Any]:
+    """Convert a caller/callee Symbol and its Edge to a JSON-serializable dict."""
     return {
-        "name": node.symbol.name,
-        "qualified_name": node.symbol.qualified_name,
-        "type": node.symbol.type.value,
-        "file": str(node.symbol.file),
-        "line": node.symbol.line,
-        "depth": depth,
-        "is_conditional": node.is_conditional,
-        "condition": node.condition,
-        "is_loop": node.is_loop,
-        "is_try_block": node.is_try_block,
-        "children": [_tree_to_dict(c, depth + 1) for c in node.children],
+        **_symbol_to_dict(symbol),
+        "call_line": edge.call_line,
+        "is_conditional": edge.is_conditional,
+        "condition": edge.condition,
+        "is_loop": edge.is_loop,
+        "is_try_block": edge.is_try_block,
     }
 
 
-@server.list_tools()  # type: ignore[no-untyped-call, untyped-decorator]
-async def list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="decoder_callers",
-            description=(
-                "Find all functions/methods that call a given symbol. "
-                "Returns callers with file locations and call context (conditional, loop, etc)."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the function/method to find callers for",
-                    },
-                },
-                "required": ["name"],
-            },
+def _tree_to_dict(root: Any) -> dict[str, Any]:
+    """Convert a TreeNode to a JSON-serializable dict.
+
+    Walks the tree with an explicit stack, so deep trees can't hit the
+    recursion limit.
+    """
+    result: dict[str, Any] = {}
+    # (node, depth, children list of the parent's dict)
+    stack: list[tuple[Any, int, list[dict[str, Any]] | None]] = [(root, 0, None)]
+    while stack:
+        node, depth, siblings = stack.pop()
+        children: list[dict[str, Any]] = []
+        entry = {
+            "name": node.symbol.name,
+            "qualified_name": node.symbol.qualified_name,
+            "type": node.symbol.type.value,
+            "file": str(node.symbol.file),
+            "line": node.symbol.line,
+            "depth": depth,
+            "is_conditional": node.is_conditional,
+            "condition": node.condition,
+            "is_loop": node.is_loop,
+            "is_try_block": node.is_try_block,
+            "children": children,
+        }
+        if siblings is None:
+            result = entry
+        else:
+            siblings.append(entry)
+        # Reversed so children are popped, and appended, in order
+        stack.extend((child, depth + 1, children) for child in reversed(node.children))
+    return result
+
+
+# Constant, so built once at import rather than on every list_tools request
+_TOOLS: list[Tool] = [
+    Tool(
+        name="decoder_callers",
+        description=(
+            "Find all functions/methods that call a given symbol. "
+            "Returns callers with file locations and call context (conditional, loop, etc)."
         ),
-        Tool(
-            name="decoder_callees",
-            description=(
-                "Find all functions/methods that a given symbol calls. "
-                "Returns callees with line numbers and call context."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the function/method to find callees for",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the function/method to find callers for",
                 },
-                "required": ["name"],
             },
+            "required": ["name"],
+        },
+    ),
+    Tool(
+        name="decoder_callees",
+        description=(
+            "Find all functions/methods that a given symbol calls. "
+            "Returns callees with line numbers and call context."
         ),
-        Tool(
-            name="decoder_trace",
-            description=(
-                "Trace the full call tree for a symbol - both callers (what calls it) "
-                "and callees (what it calls). Returns a tree structure showing the "
-                "complete call trace."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the function/method to trace",
-                    },
-                    "max_depth": {
-                        "type": "integer",
-                        "description": "Maximum depth to trace (default: 5)",
-                        "default": 5,
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the function/method to find callees for",
                 },
-                "required": ["name"],
             },
+            "required": ["name"],
+        },
+    ),
+    Tool(
+        name="decoder_trace",
+        description=(
+            "Trace the full call tree for a symbol - both callers (what calls it) "
+            "and callees (what it calls). Returns a tree structure showing the "
+            "complete call trace."
         ),
-        Tool(
-            name="decoder_find",
-            description=(
-                "Search for symbols (functions, classes, methods) by name. "
-                "Supports partial matching."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (partial name match)",
-                    },
-                    "type": {
-                        "type": "string",
-                        "enum": ["function", "class", "method"],
-                        "description": "Filter by symbol type (optional)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the function/method to trace",
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Maximum depth to trace (default: 5)",
+                    "default": 5,
                 },
-                "required": ["query"],
             },
+            "required": ["name"],
+        },
+    ),
+    Tool(
+        name="decoder_find",
+        description=(
+            "Search for symbols (functions, classes, methods) by name. Supports partial matching."
         ),
-        Tool(
-            name="decoder_stats",
-            description="Get statistics about the indexed codebase.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (partial name match)",
+                },
+                "type": {
+                    "type": "string",
+                    "enum": ["function", "class", "method"],
+                    "description": "Filter by symbol type (optional)",
+                },
             },
-        ),
-    ]
+            "required": ["query"],
+        },
+    ),
+    Tool(
+        name="decoder_stats",
+        description="Get statistics about the indexed codebase.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+]
+
+
+@server.list_tools()  # type: ignore[no-untyped-call, untyped-decorator]
+async def list_tools() -> list[Tool]:
+    """List available tools."""
+    return list(_TOOLS)
 
 
 @server.call_tool()  # type: ignore[untyped-decorator]
@@ -173,7 +270,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         else:
             result = {"error": f"Unknown tool: {name}"}
 
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_JSON_ENCODER.encode(result))]
 
     except FileNotFoundError as e:
         return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
@@ -183,113 +280,83 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
 def _handle_callers(name: str) -> dict[str, Any]:
     """Handle decoder_callers tool."""
-    with _get_repo() as repo:
-        symbols = repo.symbols.find(name)
-
-        if not symbols:
-            return {"error": f"No symbol found matching '{name}'", "results": []}
-
-        results = []
-        for symbol in symbols:
-            caller_list = repo.edges.get_callers(symbol.id)
-            results.append(
-                {
-                    "symbol": _symbol_to_dict(symbol),
-                    "callers": [
-                        {
-                            **_symbol_to_dict(caller),
-                            "call_line": edge.call_line,
-                            "is_conditional": edge.is_conditional,
-                            "condition": edge.condition,
-                            "is_loop": edge.is_loop,
-                            "is_try_block": edge.is_try_block,
-                        }
-                        for caller, edge in caller_list
-                    ],
-                }
-            )
-
-        return {"results": results}
+    return _handle_call_sites(name, "callers")
 
 
 def _handle_callees(name: str) -> dict[str, Any]:
     """Handle decoder_callees tool."""
-    with _get_repo() as repo:
-        symbols = repo.symbols.find(name)
-
-        if not symbols:
-            return {"error": f"No symbol found matching '{name}'", "results": []}
-
-        results = []
-        for symbol in symbols:
-            callee_list = repo.edges.get_callees(symbol.id)
-            results.append(
-                {
-                    "symbol": _symbol_to_dict(symbol),
-                    "callees": [
-                        {
-                            **_symbol_to_dict(callee),
-                            "call_line": edge.call_line,
-                            "is_conditional": edge.is_conditional,
-                            "condition": edge.condition,
-                            "is_loop": edge.is_loop,
-                            "is_try_block": edge.is_try_block,
-                        }
-                        for callee, edge in callee_list
-                    ],
-                }
-            )
+    return _handle_call_sites(name, "callees")
+
+
+def _handle_call_sites(name: str, direction: str) -> dict[str, Any]:
+    """List the callers or callees (``direction``) of every symbol matching name."""
+    repo = _get_repo()
+    symbols = repo.symbols.find(name)
+
+    if not symbols:
+        return {"error": f"No symbol found matching '{name}'", "results": []}
+
+    if direction == "callers":
+        pairs_by_id = repo.edges.get_callers_many([s.id for s in symbols])
+    else:
+        pairs_by_id = repo.edges.get_callees_many([s.id for s in symbols])
+
+    results = []
+    for symbol in symbols:
+        call_sites = [_call_site_to_dict(other, edge) for other, edge in pairs_by_id[symbol.id]]
+        results.append({"symbol": _symbol_to_dict(symbol), direction: call_sites})
 
-        return {"results": results}
+    return {"results": results}
 
 
 def _handle_trace(name: str, max_depth: int) -> dict[str, Any]:
     """Handle decoder_trace tool."""
-    with _get_repo() as repo:
-        symbols = repo.symbols.find(name)
+    repo = _get_repo()
+    symbols = repo.symbols.find(name)
 
-        if not symbols:
-            return {"error": f"No symbol found matching '{name}'"}
+    if not symbols:
+        return {"error": f"No symbol found matching '{name}'"}
 
-        start_symbol = max(
-            symbols,
-            key=lambda s: (len(repo.edges.get_callees(s.id)) + len(repo.edges.get_callers(s.id))),
-        )
+    counts = repo.edges.connection_counts([s.id for s in symbols])
+    start_symbol = max(symbols, key=lambda s: counts.get(s.id, 0))
 
-        graph = load_from_repository(repo)
-        callee_tree = get_callee_tree(graph, start_symbol.id, max_depth)
-        caller_tree = get_caller_tree(graph, start_symbol.id, max_depth)
+    graph = _load_graph(repo)
+    callee_tree = get_callee_tree(graph, start_symbol.id, max_depth)
+    caller_tree = get_caller_tree(graph, start_symbol.id, max_depth)
 
-        return {
-            "symbol": _symbol_to_dict(start_symbol),
-            "callers": _tree_to_dict(caller_tree) if caller_tree else None,
-            "callees": _tree_to_dict(callee_tree) if callee_tree else None,
-        }
+    return {
+        "symbol": _symbol_to_dict(start_symbol),
+        "callers": _tree_to_dict(caller_tree) if caller_tree else None,
+        "callees": _tree_to_dict(callee_tree) if callee_tree else None,
+    }
 
 
 def _handle_find(query: str, symbol_type: str | None) -> dict[str, Any]:
     """Handle decoder_find tool."""
-    from decoder.core.models import SymbolType
+    type_filter = None
+    if symbol_type:
+        type_filter = SYMBOL_TYPE_BY_VALUE.get(symbol_type)
+        if type_filter is None:
+            return {"error": f"Unknown symbol type '{symbol_type}'", "results": []}
 
-    with _get_repo() as repo:
-        type_filter = SymbolType(symbol_type) if symbol_type else None
-        symbols = repo.symbols.find(query, type_filter)
+    repo = _get_repo()
+    symbols = repo.symbols.find(query, type_filter)
 
-        return {
-            "results": [_symbol_to_dict(s) for s in symbols],
-        }
+    return {
+        "results": [_symbol_to_dict(s) for s in symbols],
+    }
 
 
 def _handle_stats() -> dict[str, Any]:
     """Handle decoder_stats tool."""
-    with _get_repo() as repo:
-        stats = repo.get_stats()
-        return {
-            "files": stats["files"],
-            "symbols": stats["symbols"],
-            "edges": stats["edges"],
-            "last_indexed": str(stats["last_indexed"]) if stats["last_indexed"] else None,
-        }
+    repo = _get_repo()
+    stats = repo.get_stats()
+    return {
+        "files": stats["files"],
+        "symbols": stats["symbols"],
+        "edges": stats["edges"],
+        "last_indexed": str(stats["last_indexed"]) if stats["last_indexed"] else None,
+    }
 
 
 async def serve() -> None:
@@ -1,13 +1,19 @@
 """Integration tests for parser and storage."""
 
+import hashlib
+import os
+import sqlite3
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
 from decoder.core.indexer import Indexer
 from decoder.core.models import EdgeType, SymbolType
-from decoder.core.storage import SymbolRepository, get_default_db_path
+from decoder.core.parse_cache import ParseCache
+from decoder.core.storage import SymbolRepository, compute_file_hash, get_default_db_path
+from decoder.core.storage import edges as edges_module
 from decoder.languages.python import PythonParser
 
 
@@ -98,6 +104,34 @@ class TestPythonParser:
         # process_order calls order.can_ship()
         assert "order.can_ship" in callee_names
 
+    def test_parse_edge_conditions(self, temp_dir: Path) -> None:
+        """Test that calls record the condition of their outermost enclosing if."""
+        code = """
+def run(items, verbose):
+    if verbose:
+        for item in items:
+            if item:
+                show(item)
+    else:
+        quiet()
+    if items and verbose and len(items) > 1000:
+        pass
+    else:
+        empty()
+"""
+        file_path = temp_dir / "conditions.py"
+        file_path.write_text(code)
+        result = PythonParser().parse(file_path)
+
+        contexts = {e.callee_name: e.context for e in result.edges}
+        assert contexts["show"] is not None
+        assert contexts["show"].condition == "verbose"
+        assert contexts["show"].loop_type == "for"
+        assert contexts["quiet"] is not None
+        assert contexts["quiet"].condition == "not (verbose)"
+        assert contexts["empty"] is not None
+        assert contexts["empty"].condition == "else"
+
 
 class TestRepository:
     """Tests for the symbol repository."""
@@ -143,6 +177,70 @@ class TestRepository:
         assert len(results) == 1
         assert results[0].name == "OrderService"
 
+        # Case-insensitive, and shorter than one trigram
+        assert [s.name for s in repository.symbols.find("us")] == ["UserService"]
+
+        repository.symbols.delete_in_file(Path("services.py"))
+        assert repository.symbols.find("Service") == []
+
+    def test_find_without_fts(
+        self, repository: SymbolRepository, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that find falls back to LIKE when SQLite lacks the trigram tokenizer."""
+        monkeypatch.setattr(
+            "decoder.core.storage.repository._supports_trigram_fts", lambda conn: False
+        )
+        for name in ["OrderService", "UserService"]:
+            repository.symbols.insert(
+                name=name,
+                qualified_name=f"services.{name}",
+                file=Path("services.py"),
+                line=1,
+                symbol_type=SymbolType.CLASS,
+            )
+
+        conn = repository._get_connection()
+        assert (
+            conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'symbols_fts'").fetchone()
+            is None
+        )
+        assert [s.name for s in repository.symbols.find("service")] == [
+            "OrderService",
+            "UserService",
+        ]
+        assert [s.name for s in repository.symbols.find("us")] == ["UserService"]
+
+    def test_get_at_line(self, repository: SymbolRepository) -> None:
+        """Test that get_at_line returns the innermost enclosing symbol."""
+        for name, line, end_line in [("Store", 1, 20), ("save", 5, 9), ("load", 12, 18)]:
+            repository.symbols.insert(
+                name=name,
+                qualified_name=f"app.{name}",
+                file=Path("app.py"),
+                line=line,
+                end_line=end_line,
+                symbol_type=SymbolType.CLASS,
+            )
+
+        assert repository.symbols.get_at_line(Path("app.py"), 7).name == "save"
+        assert repository.symbols.get_at_line(Path("app.py"), 10).name == "Store"
+        assert repository.symbols.get_at_line(Path("app.py"), 12).name == "load"
+
+    def test_id_by_qualified_name(self, repository: SymbolRepository) -> None:
+        """Test cached qualified-name lookups and their invalidation on delete."""
+        assert repository.symbols.id_by_qualified_name("test.func") is None
+        symbol_id = repository.symbols.insert(
+            name="func",
+            qualified_name="test.func",
+            file=Path("test.py"),
+            line=1,
+            symbol_type=SymbolType.FUNCTION,
+        )
+        assert repository.symbols.id_by_qualified_name("test.func") == symbol_id
+
+        repository.symbols.delete_in_file(Path("test.py"))
+        assert repository.symbols.id_by_qualified_name("test.func") is None
+
     def test_get_callers_and_callees(self, repository: SymbolRepository) -> None:
         """Test retrieving callers and callees."""
         func_a = repository.symbols.insert(
@@ -160,13 +258,17 @@ class TestRepository:
             symbol_type=SymbolType.FUNCTION,
         )
 
-        # func_a calls func_b
-        repository.edges.insert(
-            caller_id=func_a,
-            callee_id=func_b,
-            call_line=5,
-            call_type=EdgeType.CALL,
-        )
+        # func_a calls func_b; storing the same call site again is a no-op
+        edge_ids = {
+            repository.edges.insert(
+                caller_id=func_a,
+                callee_id=func_b,
+                call_line=5,
+                call_type=EdgeType.CALL,
+            )
+            for _ in range(2)
+        }
+        assert len(edge_ids) == 1
 
         # Check callees of func_a
         callees = repository.edges.get_callees(func_a)
@@ -178,6 +280,208 @@ class TestRepository:
         assert len(callers) == 1
         assert callers[0][0].name == "func_a"
 
+        counts = repository.edges.connection_counts([func_a, func_b])
+        assert counts == {func_a: 1, func_b: 1}
+
+    def test_iter_callees_dedupes_across_batches(
+        self, repository: SymbolRepository, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that streamed callees dedupe repeat calls split over fetches."""
+        monkeypatch.setattr(edges_module, "_FETCH_SIZE", 1)
+        caller, callee = (
+            repository.symbols.insert(
+                name=name,
+                qualified_name=f"test.{name}",
+                file=Path("test.py"),
+                line=line,
+                symbol_type=SymbolType.FUNCTION,
+            )
+            for name, line in [("caller", 1), ("callee", 10)]
+        )
+        # Same call site under two edge types: both stored, listed once
+        sites = [(2, EdgeType.CALL), (2, EdgeType.ATTRIBUTE), (3, EdgeType.CALL)]
+        for call_line, call_type in sites:
+            repository.edges.insert(
+                caller_id=caller, callee_id=callee, call_line=call_line, call_type=call_type
+            )
+
+        lines = [edge.call_line for _, edge in repository.edges.iter_callees(caller)]
+        assert lines == [2, 3]
+
+    def test_get_callers_and_callees_many(self, repository: SymbolRepository) -> None:
+        """Test that batched lookups match per-symbol lookups."""
+        ids = [
+            repository.symbols.insert(
+                name=name,
+                qualified_name=f"test.{name}",
+                file=Path("test.py"),
+                line=line,
+                symbol_type=SymbolType.FUNCTION,
+            )
+            for line, name in enumerate(["a", "b", "c", "d"], 1)
+        ]
+        a, b, c, d = ids
+        for caller, callee, call_line in [(a, b, 2), (a, c, 3), (b, c, 4), (a, c, 5), (c, a, 6)]:
+            repository.edges.insert(caller_id=caller, callee_id=callee, call_line=call_line)
+        repository.edges.insert(caller_id=a, callee_id=c, call_line=5, call_type=EdgeType.ATTRIBUTE)
+
+        callees = repository.edges.get_callees_many(ids)
+        callers = repository.edges.get_callers_many(ids)
+        assert list(callees) == list(callers) == ids
+        for symbol_id in ids:
+            assert callees[symbol_id] == repository.edges.get_callees(symbol_id)
+            assert callers[symbol_id] == repository.edges.get_callers(symbol_id)
+        assert callees[d] == callers[d] == []
+
+    def test_delete_file(self, repository: SymbolRepository) -> None:
+        """Test that deleting a file removes edges in both directions."""
+        ids = {}
+        for name, file in [("a", "a.py"), ("b", "b.py"), ("c", "c.py")]:
+            ids[name] = repository.symbols.insert(
+                name=name,
+                qualified_name=f"{name}.{name}",
+                file=Path(file),
+                line=1,
+                symbol_type=SymbolType.FUNCTION,
+            )
+        repository.edges.insert(caller_id=ids["a"], callee_id=ids["b"], call_line=2)
+        repository.edges.insert(caller_id=ids["b"], callee_id=ids["c"], call_line=2)
+        repository.edges.insert(caller_id=ids["a"], callee_id=ids["c"], call_line=3)
+
+        assert repository.edges.delete_for_file(Path("b.py")) == 2
+        repository.delete_file(Path("b.py"))
+
+        assert repository.symbols.find("b") == []
+        assert [s.name for s, _ in repository.edges.get_callees(ids["a"])] == ["c"]
+        assert [s.name for s, _ in repository.edges.get_callers(ids["c"])] == ["a"]
+
+    def test_bulk_load_rebuilds_indexes(self, repository: SymbolRepository) -> None:
+        """Test that bulk_load drops secondary indexes and restores them on exit."""
+        conn = repository._get_connection()
+
+        def indexes() -> set[str]:
+            rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            return {name for (name,) in rows if name.startswith("idx_")}
+
+        before = indexes()
+        assert repository.is_empty()
+        with repository.bulk_load():
+            assert "idx_edges_callee_caller_line" not in indexes()
+            assert "idx_edges_unique" in indexes()
+            # Marked stale so a crash mid-load rebuilds them on the next open
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+            assert "idx_symbols_qualified" in indexes()
+            repository.symbols.insert(
+                name="func",
+                qualified_name="test.func",
+                file=Path("test.py"),
+                line=1,
+                symbol_type=SymbolType.FUNCTION,
+            )
+        assert indexes() == before
+        assert conn.execute("PRAGMA user_version").fetchone()[0] > 0
+        assert not repository.is_empty()
+
+    def test_connection_per_thread(self, repository: SymbolRepository) -> None:
+        """Test that each thread reads through its own connection."""
+        repository.symbols.insert(
+            name="func",
+            qualified_name="test.func",
+            file=Path("test.py"),
+            line=1,
+            symbol_type=SymbolType.FUNCTION,
+        )
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            conn, found = pool.submit(
+                lambda: (repository._get_connection(), repository.symbols.find("func"))
+            ).result()
+        assert conn is not repository._get_connection()
+        assert [s.name for s in found] == ["func"]
+
+    def test_connection_pragmas(self, repository: SymbolRepository) -> None:
+        """Test that connections open in WAL mode with relaxed syncing."""
+        conn = repository._get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_transaction_rolls_back_on_error(self, repository: SymbolRepository) -> None:
+        """Test that writes inside a failed transaction are discarded together."""
+        with pytest.raises(RuntimeError), repository.transaction():
+            repository.symbols.insert(
+                name="func",
+                qualified_name="test.func",
+                file=Path("test.py"),
+                line=1,
+                symbol_type=SymbolType.FUNCTION,
+            )
+            repository.files.upsert(Path(__file__), "hash")
+            raise RuntimeError("boom")
+
+        assert repository.symbols.find("func") == []
+        assert repository.files.get(Path(__file__)) is None
+
+    def test_compute_file_hash(self, temp_dir: Path) -> None:
+        """Test that streamed hashing matches hashing the whole contents."""
+        file_path = temp_dir / "large.py"
+        content = b"x = 1\n" * 100_000  # spans many read blocks
+        file_path.write_bytes(content)
+        assert compute_file_hash(file_path) == hashlib.sha256(content).hexdigest()
+
+    def test_upsert_skips_unchanged_record(
+        self, repository: SymbolRepository, temp_dir: Path
+    ) -> None:
+        """Test that re-upserting an identical file record writes nothing."""
+        file_path = temp_dir / "module.py"
+        file_path.write_text("def func(): pass")
+        conn = repository._get_connection()
+
+        repository.files.upsert(file_path, "hash")
+        changes = conn.total_changes
+        repository.files.upsert(file_path, "hash")
+        assert conn.total_changes == changes
+
+        repository.files.upsert(file_path, "new-hash")
+        assert conn.total_changes == changes + 1
+
+    def test_needs_reindex_uses_stat(self, repository: SymbolRepository, temp_dir: Path) -> None:
+        """Test that needs_reindex trusts mtime/size and falls back to the hash."""
+        file_path = temp_dir / "module.py"
+        file_path.write_text("def func(): pass")
+        assert repository.files.needs_reindex(file_path)
+
+        repository.files.upsert(file_path, "not-the-real-hash")
+        # Same stat: the stored hash is not even checked
+        assert not repository.files.needs_reindex(file_path)
+
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert repository.files.needs_reindex(file_path)
+
+        # The hash computed for the check is handed back for reuse
+        changed = repository.files.check_for_reindex(file_path)
+        assert changed is not None
+        assert changed[0].st_mtime_ns == stat.st_mtime_ns + 1_000_000_000
+        assert changed[1] == compute_file_hash(file_path)
+
+    def test_migrates_old_files_table(self, temp_dir: Path) -> None:
+        """Test that databases without the stat columns are upgraded."""
+        db_path = get_default_db_path(temp_dir)
+        db_path.parent.mkdir(parents=True)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE files (path TEXT PRIMARY KEY, hash TEXT NOT NULL, "
+                "indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute("INSERT INTO files (path, hash) VALUES ('old.py', 'abc')")
+        conn.close()
+
+        with SymbolRepository(db_path) as repository:
+            record = repository.files.get(Path("old.py"))
+            assert record is not None
+            assert record.hash == "abc"
+            assert record.mtime_ns is None
+
 
 class TestIndexer:
     """Tests for the indexer."""
@@ -219,6 +523,106 @@ class TestIndexer:
         assert stats.files == 1  # Only module.py indexed
         assert stats.skipped == 1  # test_module.py skipped
 
+    def test_parallel_parse(
+        self, repository: SymbolRepository, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that parsing in worker processes gives the same results."""
+        monkeypatch.setattr("decoder.languages.python._PARALLEL_PARSE_THRESHOLD", 0)
+        for i in range(3):
+            (temp_dir / f"mod{i}.py").write_text(f"def func{i}(): pass")
+        (temp_dir / "bad.py").write_text("def broken(")
+
+        indexer = Indexer(repository)
+        stats = indexer.index_directory(temp_dir)
+
+        assert stats.files == 3
+        assert stats.symbols == 3
+        assert len(stats.errors) == 1
+        assert repository.symbols.find("func1")
+
+    def test_parse_cache_round_trip(
+        self, repository: SymbolRepository, temp_dir: Path, sample_python_file: Path
+    ) -> None:
+        """Test that cached parse results match a fresh parse and are reused."""
+        file_path = sample_python_file
+        cache = ParseCache(temp_dir / "parse_cache")
+
+        fresh = PythonParser().parse(file_path)
+        cache.put(file_path, "hash", fresh)
+        cached = cache.get(file_path, "hash")
+        assert cached is not None
+        assert cached == fresh
+        assert all(symbol.file is cached.file for symbol in cached.symbols)
+        assert cache.get(file_path, "other-hash") is None
+
+        indexer = Indexer(repository, cache)
+        first = indexer.index_directory(temp_dir, force=True)
+        second = indexer.index_directory(temp_dir, force=True)
+        assert (second.symbols, second.edges) == (first.symbols, first.edges)
+
+    def test_excluded_directories_are_pruned(
+        self, repository: SymbolRepository, temp_dir: Path
+    ) -> None:
+        """Test that files under excluded directories are never visited."""
+        (temp_dir / "module.py").write_text("def func(): pass")
+        (temp_dir / "node_modules" / "pkg").mkdir(parents=True)
+        (temp_dir / "node_modules" / "pkg" / "setup.py").write_text("def setup(): pass")
+        (temp_dir / ".hidden").mkdir()
+        (temp_dir / ".hidden" / "secret.py").write_text("def secret(): pass")
+
+        indexer = Indexer(repository)
+        stats = indexer.index_directory(temp_dir)
+
+        assert stats.files == 1
+        assert stats.skipped == 0
+
+    def test_duplicate_edges_not_counted(
+        self, repository: SymbolRepository, temp_dir: Path
+    ) -> None:
+        """Test that edges dropped as duplicates are not counted in the stats."""
+        file_path = temp_dir / "dup.py"
+        file_path.write_text("""
+class A:
+    def f(self): ...
+
+    def g(self):
+        return self.f() + self.f()
+""")
+
+        def stored_edges() -> int:
+            conn = repository._get_connection()
+            return int(conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0])
+
+        indexer = Indexer(repository)
+        stats = indexer.index_directory(temp_dir)
+        assert stats.edges == stored_edges() == 1
+
+        stats = indexer.index_file(file_path)
+        assert stats.edges == stored_edges() == 1
+
+    def test_rebound_class_keeps_self_calls(
+        self, repository: SymbolRepository, temp_dir: Path
+    ) -> None:
+        """Test that rebinding a class name at module level keeps its self calls."""
+        (temp_dir / "client.py").write_text("""
+class Client:
+    def run(self):
+        self.step()
+
+    def step(self): ...
+
+
+Client = Client
+""")
+
+        indexer = Indexer(repository)
+        stats = indexer.index_directory(temp_dir)
+
+        assert stats.edges == 1
+        step = repository.symbols.find("step")[0]
+        callers = repository.edges.get_callers(step.id)
+        assert [symbol.name for symbol, _edge in callers] == ["run"]
+
 
 class TestTypedParameterResolution:
     """Tests for resolving method calls on typed parameters."""
@@ -358,6 +762,31 @@ def create_todo_handler(service: TodoService, title: str) -> dict:
         repo_caller_names = [c[0].name for c in repo_callers]
         assert "create_todo" in repo_caller_names
 
+    def test_typed_call_resolves_into_unchanged_file(
+        self, repository: SymbolRepository, temp_dir: Path
+    ) -> None:
+        """Test that re-indexing one file still resolves calls into files left untouched."""
+        (temp_dir / "services.py").write_text(
+            "class OrderService:\n    def create_order(self, item: str) -> None:\n        pass\n"
+        )
+        routes = temp_dir / "routes.py"
+        routes.write_text(
+            "from services import OrderService\n\n"
+            "def route(service: OrderService) -> None:\n    service.create_order('x')\n"
+        )
+
+        indexer = Indexer(repository)
+        indexer.index_directory(temp_dir)
+        routes.write_text(routes.read_text() + "\n\ndef other() -> None:\n    pass\n")
+
+        stats = Indexer(repository).index_directory(temp_dir)
+        assert stats.files == 1
+        assert stats.unchanged == 1
+
+        (create_order,) = repository.symbols.find("create_order")
+        callers = repository.edges.get_callers(create_order.id)
+        assert [c[0].name for c in callers] == ["route"]
+
 
 class TestInstanceVariableTracking:
     """Tests for tracking types assigned to self.x in __init__."""
@@ -440,3 +869,87 @@ class DataService:
         load_callers = repository.edges.get_callers(store_load.id)
         load_caller_names = [c[0].name for c in load_callers]
         assert "load_data" in load_caller_names
+
+
+class TestGraphLoader:
+    """Tests for loading the call graph from the repository."""
+
+    def test_load_from_repository(self, repository: SymbolRepository, temp_dir: Path) -> None:
+        """Test that indexed symbols and edges round-trip into a CallGraph."""
+        from decoder.core.graph import load_from_repository
+
+        code = """
+class App:
+    def helper(self) -> int:
+        return 1
+
+    def main(self, verbose: bool) -> None:
+        if verbose:
+            self.helper()
+"""
+        (temp_dir / "app.py").write_text(code)
+        Indexer(repository).index_directory(temp_dir)
+
+        graph = load_from_repository(repository)
+        assert graph.num_nodes == repository.get_stats()["symbols"]
+        assert graph.num_edges == repository.get_stats()["edges"]
+
+        main = next(s for s in graph.symbols.values() if s.name == "main")
+        assert main.type == SymbolType.METHOD
+        callees = graph.get_callees(main.id)
+        assert [s.name for s, _ in callees] == ["helper"]
+        assert callees[0][1].call_type == EdgeType.CALL
+        assert callees[0][1].is_conditional is True
+        assert callees[0][1].condition == "verbose"
+
+    def test_load_from_repository_is_lazy(
+        self, repository: SymbolRepository, temp_dir: Path
+    ) -> None:
+        """Test that symbols are only materialized when looked up."""
+        from decoder.core.graph import load_from_repository
+        from decoder.core.graph.analysis import has_cycle
+
+        (temp_dir / "app.py").write_text("def a(): pass\ndef b(): pass\n")
+        Indexer(repository).index_directory(temp_dir)
+
+        graph = load_from_repository(repository)
+        assert graph.num_nodes == 2
+        assert has_cycle(graph) is False
+        assert graph._symbols == {}
+
+        first_id = next(iter(graph._sym_rows))
+        assert first_id in graph
+        assert graph[first_id].name == "a"
+        assert list(graph._symbols) == [first_id]
+
+        assert [s.name for s in graph.symbols.values()] == ["a", "b"]
+
+    def test_load_subgraph(self, repository: SymbolRepository) -> None:
+        """Test that load_subgraph stops at max_depth in both directions."""
+        from decoder.core.graph import load_subgraph
+
+        ids = [
+            repository.symbols.insert(
+                name=name,
+                qualified_name=f"test.{name}",
+                file=Path("test.py"),
+                line=i * 10,
+                symbol_type=SymbolType.FUNCTION,
+            )
+            for i, name in enumerate(["a", "b", "c", "d"])
+        ]
+        for caller, callee in zip(ids, ids[1:]):
+            repository.edges.insert(caller_id=caller, callee_id=callee, call_line=1)
+
+        graph = load_subgraph(repository, ids[0], direction="callees", max_depth=1)
+        assert {s.name for s in graph.symbols.values()} == {"a", "b"}
+
+        graph = load_subgraph(repository, ids[3], direction="callers", max_depth=10)
+        assert {s.name for s in graph.symbols.values()} == {"a", "b", "c", "d"}
+        assert graph.num_edges == 3
+
+        # Diamond: a -> c is a second route to c; its edges must load once.
+        repository.edges.insert(caller_id=ids[0], callee_id=ids[2], call_line=2)
+        graph = load_subgraph(repository, ids[0], direction="callees", max_depth=10)
+        assert graph.num_edges == 4
+        assert graph.in_degree(ids[3]) == 1
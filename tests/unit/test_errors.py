@@ -1,5 +1,6 @@
 """Tests for error handling paths."""
 
+import os
 import tempfile
 from pathlib import Path
 
@@ -28,44 +29,57 @@ def repository(temp_dir: Path) -> SymbolRepository:
 class TestParserErrors:
     """Tests for parser error handling."""
 
-    def test_parse_syntax_error(self, temp_dir: Path) -> None:
+    def test_parse_syntax_error(self) -> None:
         """Test that syntax errors raise ParseError."""
-        bad_code = """
+        bad_code = b"""
 def broken(
     # Missing closing paren and colon
 """
-        file_path = temp_dir / "bad_syntax.py"
-        file_path.write_text(bad_code)
-
         parser = PythonParser()
         with pytest.raises(ParseError) as exc_info:
-            parser.parse(file_path)
+            parser.parse_source(bad_code, Path("bad_syntax.py"))
 
         assert "Syntax error" in str(exc_info.value)
 
-    def test_parse_encoding_error(self, temp_dir: Path) -> None:
+    def test_parse_encoding_error(self) -> None:
         """Test that encoding errors raise ParseError."""
-        file_path = temp_dir / "bad_encoding.py"
-        # Write invalid UTF-8 bytes
-        file_path.write_bytes(b"\xff\xfe invalid utf-8 \x80\x81")
+        # Invalid UTF-8 bytes
+        source = b"\xff\xfe invalid utf-8 \x80\x81"
 
         parser = PythonParser()
         with pytest.raises(ParseError) as exc_info:
-            parser.parse(file_path)
+            parser.parse_source(source, Path("bad_encoding.py"))
 
         assert "Cannot read" in str(exc_info.value)
 
-    def test_parse_empty_file(self, temp_dir: Path) -> None:
-        """Test that empty files parse without error."""
-        file_path = temp_dir / "empty.py"
-        file_path.write_text("")
+    def test_parse_declared_encoding(self) -> None:
+        """Test that a PEP 263 coding declaration is honoured."""
+        source = b"# -*- coding: latin-1 -*-\ndef caf\xe9(): pass\n"
 
         parser = PythonParser()
-        result = parser.parse(file_path)
+        result = parser.parse_source(source, Path("latin1.py"))
+
+        assert [s.name for s in result.symbols] == ["café"]
+
+    def test_parse_empty_file(self) -> None:
+        """Test that empty files parse without error."""
+        parser = PythonParser()
+        result = parser.parse_source(b"", Path("empty.py"))
 
         assert result.symbols == []
         assert result.edges == []
 
+    def test_parse_reads_file(self, temp_dir: Path) -> None:
+        """Test that parse reads the file and reports errors against its path."""
+        file_path = temp_dir / "bad_syntax.py"
+        file_path.write_text("def broken(")
+
+        parser = PythonParser()
+        with pytest.raises(ParseError) as exc_info:
+            parser.parse(file_path)
+
+        assert str(file_path) in str(exc_info.value)
+
 
 class TestStorageErrors:
     """Tests for storage error handling."""
@@ -151,6 +165,30 @@ class TestIndexerErrors:
         assert stats.files == 1
         assert stats.skipped == 1
 
+    def test_index_directory_prunes_excluded_dirs(
+        self, repository: SymbolRepository, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that excluded directories are never walked into."""
+        (temp_dir / "include.py").write_text("def included(): pass")
+        tests_dir = temp_dir / "tests"
+        tests_dir.mkdir()
+        (tests_dir / "test_something.py").write_text("def test_excluded(): pass")
+
+        walked = []
+        real_walk = os.walk
+
+        def recording_walk(top, *args, **kwargs):
+            for entry in real_walk(top, *args, **kwargs):
+                walked.append(Path(entry[0]))
+                yield entry
+
+        monkeypatch.setattr(os, "walk", recording_walk)
+        indexer = Indexer(repository)
+        stats = indexer.index_directory(temp_dir, exclude_patterns=["tests"])
+
+        assert stats.files == 1
+        assert walked == [temp_dir]
+
     def test_index_unchanged_files_skipped(
         self, repository: SymbolRepository, temp_dir: Path
     ) -> None:
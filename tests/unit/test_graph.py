@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from decoder.core.graph import CallGraph
+from decoder.core.graph import CallGraph, TreeNode
 from decoder.core.graph.analysis import (
     find_cycles,
     get_entry_points,
@@ -14,7 +14,12 @@ from decoder.core.graph.analysis import (
     topological_sort,
 )
 from decoder.core.graph.pathfinding import all_paths, shortest_path
-from decoder.core.graph.traversal import get_callee_tree, get_caller_tree
+from decoder.core.graph.traversal import (
+    flatten_tree,
+    get_callee_tree,
+    get_caller_tree,
+    iter_tree,
+)
 from decoder.core.models import Edge, EdgeType, Symbol, SymbolType
 
 
@@ -120,6 +125,36 @@ class TestCallGraph:
         graph.add_symbol(make_symbol(1, "A"))
         assert graph.get_callers(1) == []
 
+    def test_bulk_load_matches_incremental(self, branching_graph: CallGraph) -> None:
+        symbols = list(branching_graph.symbols.values())
+        edges = [make_edge(1, 1, 2), make_edge(2, 1, 3), make_edge(3, 2, 4), make_edge(4, 3, 4)]
+        graph = CallGraph._bulk_load(symbols, edges)
+
+        assert graph.num_nodes == branching_graph.num_nodes
+        assert graph.num_edges == branching_graph.num_edges
+        for sid in graph.symbols:
+            assert graph.get_callees(sid) == branching_graph.get_callees(sid)
+            assert graph.get_callers(sid) == branching_graph.get_callers(sid)
+
+    def test_degrees(self, branching_graph: CallGraph) -> None:
+        assert branching_graph.out_degree(1) == 2
+        assert branching_graph.in_degree(1) == 0
+        assert branching_graph.in_degree(4) == 2
+        assert branching_graph.out_degree(999) == 0
+
+    def test_freeze_builds_csr(self, branching_graph: CallGraph) -> None:
+        csr = branching_graph.freeze()
+        assert list(csr.ids) == [1, 2, 3, 4]
+        assert list(csr.neighbors(csr.index[1])) == [csr.index[2], csr.index[3]]
+        assert list(csr.neighbors(csr.index[4])) == []
+        assert branching_graph.freeze() is csr
+
+    def test_freeze_invalidated_by_mutation(self, linear_graph: CallGraph) -> None:
+        csr = linear_graph.freeze()
+        linear_graph.add_edge(make_edge(4, 4, 1))
+        assert linear_graph.freeze() is not csr
+        assert len(linear_graph.freeze().col_ind) == 4
+
 
 class TestCycleDetection:
     """Tests for cycle detection algorithms."""
@@ -160,6 +195,22 @@ class TestCycleDetection:
         cycles = find_cycles(graph, max_cycles=2)
         assert len(cycles) <= 2
 
+    def test_deep_chain_does_not_recurse(self) -> None:
+        """Chains deeper than the recursion limit are handled iteratively."""
+        graph = CallGraph()
+        n = 5000
+        for i in range(1, n + 1):
+            graph.add_symbol(make_symbol(i, f"N{i}"))
+        for i in range(1, n):
+            graph.add_edge(make_edge(i, i, i + 1))
+
+        assert has_cycle(graph) is False
+        assert find_cycles(graph) == []
+
+        graph.add_edge(make_edge(n, n, 1))
+        assert has_cycle(graph) is True
+        assert len(find_cycles(graph)[0]) == n
+
 
 class TestEntryAndLeafPoints:
     """Tests for entry point and leaf function detection."""
@@ -259,6 +310,35 @@ class TestTraversal:
         caller_names = {c.symbol.name for c in tree.children}
         assert caller_names == {"B", "C"}
 
+    def test_deep_tree_does_not_recurse(self) -> None:
+        graph = CallGraph()
+        n = 3000
+        for i in range(1, n + 1):
+            graph.add_symbol(make_symbol(i, f"N{i}"))
+        for i in range(1, n):
+            graph.add_edge(make_edge(i, i, i + 1))
+
+        tree = get_callee_tree(graph, root_id=1, max_depth=n)
+        assert tree is not None
+        assert len(tree) == n
+        flat = flatten_tree(tree, include_root=False)
+        assert len(flat) == n - 1
+        assert flat[-1].symbol.name == f"N{n}"
+
+    def test_iter_tree_matches_materialized_tree(
+        self, branching_graph: CallGraph, cyclic_graph: CallGraph
+    ) -> None:
+        for graph, root in ((branching_graph, 1), (cyclic_graph, 1)):
+            for direction, build in (("callees", get_callee_tree), ("callers", get_caller_tree)):
+                tree = build(graph, root, 10)
+                assert tree is not None
+                streamed = [(d, s.name) for d, s, _, _ in iter_tree(graph, root, direction)]
+                assert streamed == [(n.depth, n.symbol.name) for n in tree]
+
+    def test_iter_tree_marks_last_sibling(self, branching_graph: CallGraph) -> None:
+        rows = [(s.name, last) for _, s, _, last in iter_tree(branching_graph, 1, max_depth=1)]
+        assert rows == [("A", True), ("B", False), ("C", True)]
+
 
 class TestPathfinding:
     """Tests for path finding algorithms."""
@@ -280,6 +360,21 @@ class TestPathfinding:
         path = shortest_path(disconnected_graph, from_id=1, to_id=4)
         assert path is None
 
+    def test_shortest_path_prefers_shortcut(self) -> None:
+        graph = CallGraph()
+        names = ["A", "B", "C", "D", "E", "X"]
+        for i, name in enumerate(names, start=1):
+            graph.add_symbol(make_symbol(i, name))
+        for edge_id, (caller, callee) in enumerate(
+            [(1, 2), (2, 3), (3, 4), (4, 5), (1, 6), (6, 5)]
+        ):
+            graph.add_edge(make_edge(edge_id, caller, callee))
+
+        path = shortest_path(graph, from_id=1, to_id=5)
+        assert path is not None
+        assert [n.name for n in path.nodes] == ["A", "X", "E"]
+        assert [(e.caller_id, e.callee_id) for e in path.edges] == [(1, 6), (6, 5)]
+
     def test_shortest_path_nonexistent_node(self, linear_graph: CallGraph) -> None:
         path = shortest_path(linear_graph, from_id=1, to_id=999)
         assert path is None
@@ -306,6 +401,11 @@ class TestPathfinding:
         paths = all_paths(branching_graph, from_id=1, to_id=4, max_paths=1)
         assert len(paths) == 1
 
+    def test_all_paths_respects_max_depth(self, linear_graph: CallGraph) -> None:
+        assert all_paths(linear_graph, from_id=1, to_id=4, max_depth=2) == []
+        paths = all_paths(linear_graph, from_id=1, to_id=4, max_depth=3)
+        assert [[n.name for n in p.nodes] for p in paths] == [["A", "B", "C", "D"]]
+
 
 class TestTreeNode:
     """Tests for TreeNode iteration and length."""
@@ -320,3 +420,35 @@ class TestTreeNode:
         assert tree is not None
         names = [node.symbol.name for node in tree]
         assert names == ["A", "B", "C", "D"]
+
+    def test_tree_node_size(self, branching_graph: CallGraph) -> None:
+        tree = get_caller_tree(branching_graph, root_id=4, max_depth=10)
+        assert tree is not None
+        assert len(tree) == len(list(tree)) == 5  # D, B, A, C, A
+        assert [len(c) for c in tree.children] == [2, 2]
+
+    def test_hand_built_tree_equals_built_tree(self, linear_graph: CallGraph) -> None:
+        tree = get_callee_tree(linear_graph, root_id=3, max_depth=10)
+        assert tree is not None
+        child = tree.children[0]
+        hand_built = TreeNode(
+            tree.symbol, tree.edge, tree.depth, [TreeNode(child.symbol, child.edge, child.depth)]
+        )
+        assert hand_built == tree
+
+    def test_hand_built_tree_len(self) -> None:
+        root = TreeNode(make_symbol(1, "A"), None, 0)
+        child = TreeNode(make_symbol(2, "B"), make_edge(1, 1, 2), 1)
+        root.children.append(child)
+        child.children.append(TreeNode(make_symbol(3, "C"), make_edge(2, 2, 3), 2))
+        assert len(root) == len(list(root)) == 3
+        assert len(child) == 2
+
+    def test_extended_tree_len(self, linear_graph: CallGraph) -> None:
+        tree = get_callee_tree(linear_graph, root_id=1, max_depth=10)
+        assert tree is not None
+        leaf = tree.children[0].children[0]
+        leaf.children.append(TreeNode(make_symbol(9, "X"), make_edge(9, 3, 9), leaf.depth + 1))
+        tree.children.append(TreeNode(make_symbol(8, "Y"), make_edge(8, 1, 8), 1))
+        assert len(tree) == len(list(tree)) == 6
+        assert len(tree.children[0]) == 4